@@ -1,4 +1,5 @@
 import requests
+from requests.adapters import HTTPAdapter
 import os
 import json
 from datetime import datetime, timedelta
@@ -6,11 +7,69 @@ from django.core.cache import cache
 from django.conf import settings
 import logging
 import time
-import re
-from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 logger = logging.getLogger(__name__)
 
+# Browser-like headers expected by the Yahoo Finance JSON endpoints
+YAHOO_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "application/json",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://finance.yahoo.com/",
+    "Origin": "https://finance.yahoo.com"
+}
+
+# Headers for the NSE website/API, which rejects non-browser clients
+NSE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "application/json",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Connection": "keep-alive",
+    "Referer": "https://www.nseindia.com/"
+}
+
+# Market indices shown in the snapshot, in display order, with static values
+# (based on Groww data) used when no live or recently cached quote is available
+MARKET_INDEX_FALLBACKS = {
+    'NIFTY': {'price': 24836.30, 'change': 225.20, 'change_percent': 0.92},
+    'SENSEX': {'price': 80983.31, 'change': 715.69, 'change_percent': 0.89},
+    'BANKNIFTY': {'price': 55347.95, 'change': 712.10, 'change_percent': 1.30},
+    'MIDCPNIFTY': {'price': 12698.15, 'change': 98.90, 'change_percent': 0.78}
+}
+
+# Yahoo Finance symbols to try for each index
+INDEX_YAHOO_SYMBOLS = {
+    'NIFTY': ('^NSEI', 'NIFTY.NS'),
+    'SENSEX': ('^BSESN', 'SENSEX.BO'),
+    'BANKNIFTY': ('^NSEBANK', 'BANKNIFTY.NS'),
+    'MIDCPNIFTY': ('^CNXMDCP', 'MIDCPNIFTY.NS')
+}
+
+# (connect, read) timeouts for index quotes, and the overall time budget for a
+# snapshot, so a slow upstream cannot hold a worker for long
+INDEX_REQUEST_TIMEOUT = (1.0, 2.0)
+INDEX_FETCH_BUDGET = 3.0
+
+# Plausible (low, high) price range used to reject bad quotes
+DEFAULT_PRICE_BOUNDS = (1, 100000)
+PRICE_BOUNDS = {
+    'RELIANCE': (1000, 5000),
+    'TCS': (2000, 6000),
+    'INFY': (1000, 3000)
+}
+
+# Upper bound on concurrent per-symbol price fallbacks in get_stock_prices
+PRICE_FETCH_WORKERS = 16
+
+# Index names as reported by NSE allIndices (SENSEX is BSE, not NSE)
+NSE_INDEX_NAMES = {
+    'NIFTY': 'NIFTY 50',
+    'BANKNIFTY': 'NIFTY BANK',
+    'MIDCPNIFTY': 'NIFTY MIDCAP 100'
+}
+
 class StockDataService:
     """
     Production-ready stock data service with multiple API fallbacks
@@ -22,6 +81,12 @@ class StockDataService:
         # Cache timeout - 60 seconds for live data
         self.cache_timeout = 60
         
+        # Shared keep-alive session so repeated API calls reuse TCP/TLS connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
         # Log API key status (without exposing keys)
         logger.info(f"Finnhub API: {'Configured' if self.finnhub_key else 'Not configured (optional fallback)'}")
         
@@ -60,7 +125,7 @@ class StockDataService:
         # Check cache first
         cache_key = f"stock_price_{clean_symbol}"
         cached_price = cache.get(cache_key)
-        if cached_price:
+        if cached_price is not None:
             logger.info(f"Cache hit for {clean_symbol}: {cached_price}")
             return cached_price
         
@@ -100,6 +165,60 @@ class StockDataService:
             cache.set(cache_key, fallback_price, 60)  # Cache fallback for only 1 minute during market hours
             return fallback_price
     
+    def get_stock_prices(self, symbols):
+        """
+        Get prices for several symbols, reading all cached prices in one round-trip.
+        Cache misses are quoted together in one batched Yahoo request; anything that
+        still has no price goes through get_stock_price.
+        Returns a dict keyed by the symbols as given.
+        """
+        clean = {symbol: symbol.upper().replace('.NS', '').replace('.BO', '') for symbol in symbols}
+        cached = cache.get_many([f"stock_price_{c}" for c in set(clean.values())])
+        
+        found = {key[len("stock_price_"):]: price for key, price in cached.items() if price is not None}
+        missing = sorted(set(clean.values()) - found.keys())
+        logger.debug("Price cache: %d hits, %d misses", len(found), len(missing))
+        if missing:
+            batch = self._fetch_quote_batch(missing)
+            cache.set_many({f"stock_price_{c}": price for c, price in batch.items()}, self.cache_timeout)
+            found.update(batch)
+        
+        # Symbols the batch could not price each walk the full fallback chain; run those
+        # concurrently so the slowest one bounds the wait instead of their sum
+        unpriced = [symbol for symbol, clean_symbol in clean.items() if clean_symbol not in found]
+        if unpriced:
+            with ThreadPoolExecutor(max_workers=min(PRICE_FETCH_WORKERS, len(unpriced))) as executor:
+                fallback = dict(zip(unpriced, executor.map(self.get_stock_price, unpriced)))
+        else:
+            fallback = {}
+        
+        return {
+            symbol: found[clean_symbol] if clean_symbol in found else fallback[symbol]
+            for symbol, clean_symbol in clean.items()
+        }
+    
+    def _fetch_quote_batch(self, symbols):
+        """Quote several NSE symbols with one Yahoo v7 request; returns {symbol: price} for the hits"""
+        prices = {}
+        try:
+            response = self.session.get(
+                "https://query1.finance.yahoo.com/v7/finance/quote",
+                params={"symbols": ",".join(f"{symbol}.NS" for symbol in symbols)},
+                headers=YAHOO_HEADERS,
+                timeout=10
+            )
+            if response.status_code == 200:
+                for item in response.json().get("quoteResponse", {}).get("result", []):
+                    symbol = item.get("symbol", "").replace('.NS', '')
+                    price = item.get("regularMarketPrice")
+                    if price is None:
+                        price = item.get("regularMarketPreviousClose")
+                    if price is not None and self._validate_price(float(price), symbol):
+                        prices[symbol] = float(price)
+        except Exception as e:
+            logger.debug(f"Yahoo Finance batch quote failed for {len(symbols)} symbols: {e}")
+        return prices
+    
     def _fetch_finnhub_api(self, symbol):
         """Fetch from Finnhub API (fallback for stocks)"""
         try:
@@ -118,7 +237,7 @@ class StockDataService:
                     'token': self.finnhub_key
                 }
                 
-                response = requests.get(url, params=params, timeout=10)
+                response = self.session.get(url, params=params, timeout=10)
                 if response.status_code == 200:
                     data = response.json()
                     price = data.get('c')  # Current price
@@ -165,15 +284,7 @@ class StockDataService:
                             url = endpoint
                             params = {"symbols": sym}
                         
-                        headers = {
-                            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                            "Accept": "application/json",
-                            "Accept-Language": "en-US,en;q=0.9",
-                            "Referer": "https://finance.yahoo.com/",
-                            "Origin": "https://finance.yahoo.com"
-                        }
-                        
-                        response = requests.get(url, params=params, headers=headers, timeout=10, verify=False)
+                        response = self.session.get(url, params=params, headers=YAHOO_HEADERS, timeout=10, verify=False)
                         
                         if response.status_code == 200:
                             data = response.json()
@@ -183,8 +294,10 @@ class StockDataService:
                                 result = data.get("chart", {}).get("result", [])
                                 if result and len(result) > 0:
                                     meta = result[0].get("meta", {})
-                                    price = meta.get("regularMarketPrice") or meta.get("previousClose")
-                                    if price:
+                                    price = meta.get("regularMarketPrice")
+                                    if price is None:
+                                        price = meta.get("previousClose")
+                                    if price is not None:
                                         price_float = float(price)
                                         if self._validate_price(price_float, symbol):
                                             logger.info(f"Yahoo Finance (chart API) success for {sym}: {price_float}")
@@ -194,8 +307,10 @@ class StockDataService:
                                 result = data.get("quoteResponse", {}).get("result", [])
                                 if result:
                                     item = result[0]
-                                    price = item.get("regularMarketPrice") or item.get("regularMarketPreviousClose")
-                                    if price:
+                                    price = item.get("regularMarketPrice")
+                                    if price is None:
+                                        price = item.get("regularMarketPreviousClose")
+                                    if price is not None:
                                         price_float = float(price)
                                         if self._validate_price(price_float, symbol):
                                             logger.info(f"Yahoo Finance (quote API) success for {sym}: {price_float}")
@@ -209,312 +324,6 @@ class StockDataService:
             logger.error(f"Yahoo Finance API error for {symbol}: {e}")
         return None
 
-    def _fetch_nse_official(self, symbol):
-        """Fetch from NSE Official API"""
-        try:
-            url = f"https://www.nseindia.com/api/quote-equity?symbol={symbol}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'application/json',
-                'Referer': 'https://www.nseindia.com/'
-            }
-            
-            # Get session first
-            session = requests.Session()
-            session.get('https://www.nseindia.com/', headers=headers, timeout=10)
-            
-            response = session.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                price_info = data.get('priceInfo', {})
-                price = price_info.get('lastPrice')
-                if price:
-                    price_float = float(price)
-                    if self._validate_price(price_float, symbol):
-                        return price_float
-            elif response.status_code == 401:
-                logger.warning(f"NSE Official API: Unauthorized (401) for {symbol} - may be rate limited or blocked")
-            elif response.status_code == 403:
-                logger.warning(f"NSE Official API: Forbidden (403) for {symbol} - may be blocked")
-            else:
-                logger.warning(f"NSE Official API: HTTP {response.status_code} for {symbol}")
-        except Exception as e:
-            logger.error(f"NSE Official error for {symbol}: {e}")
-        return None
-
-    def _fetch_bse_official(self, symbol):
-        """Fetch from BSE Official API"""
-        try:
-            url = f"https://api.bseindia.com/BseIndiaAPI/api/StockReachGraph/w?scripcode={symbol}&flag=0&fromdate=&todate=&seriesid="
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'application/json'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                # BSE API structure may vary, this is a basic implementation
-                if isinstance(data, dict) and 'data' in data:
-                    price_data = data['data']
-                    if isinstance(price_data, list) and len(price_data) > 0:
-                        latest = price_data[-1]
-                        if isinstance(latest, dict) and 'close' in latest:
-                            price_float = float(latest['close'])
-                            if self._validate_price(price_float, symbol):
-                                return price_float
-        except Exception as e:
-            logger.error(f"BSE Official error for {symbol}: {e}")
-        return None
-
-    def _fetch_indian_api(self, symbol):
-        """Fetch from IndianAPI.in - Free Indian stock API"""
-        try:
-            # IndianAPI.in free endpoint
-            url = f"https://indianapi.in/api/stock/{symbol}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'application/json',
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                # Try different possible price fields
-                price = (data.get('price') or 
-                        data.get('lastPrice') or 
-                        data.get('currentPrice') or
-                        data.get('close') or
-                        data.get('ltp'))
-                if price:
-                    price_float = float(price)
-                    if self._validate_price(price_float, symbol):
-                        print(f"IndianAPI: Got price {price_float} for {symbol}")
-                        return price_float
-        except Exception as e:
-            print(f"IndianAPI error for {symbol}: {e}")
-        return None
-    
-    def _fetch_moneycontrol(self, symbol):
-        """Fetch from Moneycontrol scraping"""
-        try:
-            # Moneycontrol stock page
-            url = f"https://www.moneycontrol.com/india/stockpricequote/{symbol.lower()}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Look for price in various selectors
-                price_selectors = [
-                    '.pcnsb div:nth-child(1) .lastprice',
-                    '.lastprice',
-                    '.pcnsb .lastprice',
-                    '[class*="lastprice"]',
-                    '.price'
-                ]
-                
-                for selector in price_selectors:
-                    price_elem = soup.select_one(selector)
-                    if price_elem:
-                        price_text = price_elem.get_text().strip()
-                        # Extract numeric value
-                        import re
-                        price_match = re.search(r'[\d,]+\.?\d*', price_text.replace(',', ''))
-                        if price_match:
-                            price_float = float(price_match.group())
-                            if self._validate_price(price_float, symbol):
-                                print(f"Moneycontrol: Got price {price_float} for {symbol}")
-                                return price_float
-        except Exception as e:
-            print(f"Moneycontrol error for {symbol}: {e}")
-        return None
-    
-    def _fetch_economic_times(self, symbol):
-        """Fetch from Economic Times scraping"""
-        try:
-            # Economic Times stock page
-            url = f"https://economictimes.indiatimes.com/markets/stocks/stock-quotes/{symbol.lower()}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Look for price in various selectors
-                price_selectors = [
-                    '.lastPrice',
-                    '.ltp',
-                    '[class*="price"]',
-                    '.stock-price',
-                    '.current-price'
-                ]
-                
-                for selector in price_selectors:
-                    price_elem = soup.select_one(selector)
-                    if price_elem:
-                        price_text = price_elem.get_text().strip()
-                        # Extract numeric value
-                        price_match = re.search(r'[\d,]+\.?\d*', price_text.replace(',', ''))
-                        if price_match:
-                            price_float = float(price_match.group())
-                            if self._validate_price(price_float, symbol):
-                                print(f"Economic Times: Got price {price_float} for {symbol}")
-                                return price_float
-        except Exception as e:
-            print(f"Economic Times error for {symbol}: {e}")
-        return None
-    
-    def _fetch_google_finance(self, symbol):
-        """Fetch from Google Finance scraping"""
-        try:
-            # Google Finance search
-            search_query = f"{symbol} NSE stock price"
-            url = f"https://www.google.com/search?q={quote(search_query)}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Look for price in Google's knowledge panel or search results
-                price_selectors = [
-                    '.BNeawe.iBp4i.AP7Wnd',
-                    '.BNeawe.deIvCb.AP7Wnd',
-                    '[data-attrid="Price"]',
-                    '.knowledge-finance-wholepage-price'
-                ]
-                
-                for selector in price_selectors:
-                    price_elem = soup.select_one(selector)
-                    if price_elem:
-                        price_text = price_elem.get_text().strip()
-                        # Extract numeric value
-                        price_match = re.search(r'[\d,]+\.?\d*', price_text.replace(',', ''))
-                        if price_match:
-                            price_float = float(price_match.group())
-                            if self._validate_price(price_float, symbol):
-                                print(f"Google Finance: Got price {price_float} for {symbol}")
-                                return price_float
-        except Exception as e:
-            print(f"Google Finance error for {symbol}: {e}")
-        return None
-    
-    def _fetch_investing_com(self, symbol):
-        """Fetch from Investing.com scraping"""
-        try:
-            # Investing.com stock page
-            url = f"https://www.investing.com/equities/{symbol.lower()}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Look for price in various selectors
-                price_selectors = [
-                    '.last-price',
-                    '.instrument-price_last__KQzyA',
-                    '.text-5xl',
-                    '[data-test="instrument-price-last"]'
-                ]
-                
-                for selector in price_selectors:
-                    price_elem = soup.select_one(selector)
-                    if price_elem:
-                        price_text = price_elem.get_text().strip()
-                        # Extract numeric value
-                        price_match = re.search(r'[\d,]+\.?\d*', price_text.replace(',', ''))
-                        if price_match:
-                            price_float = float(price_match.group())
-                            if self._validate_price(price_float, symbol):
-                                print(f"Investing.com: Got price {price_float} for {symbol}")
-                                return price_float
-        except Exception as e:
-            print(f"Investing.com error for {symbol}: {e}")
-        return None
-    
-    def _fetch_marketwatch(self, symbol):
-        """Fetch from MarketWatch scraping"""
-        try:
-            # MarketWatch stock page
-            url = f"https://www.marketwatch.com/investing/stock/{symbol.lower()}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Look for price in various selectors
-                price_selectors = [
-                    '.value',
-                    '.last-value',
-                    '.intraday__price',
-                    '[data-module="MarketData"] .value'
-                ]
-                
-                for selector in price_selectors:
-                    price_elem = soup.select_one(selector)
-                    if price_elem:
-                        price_text = price_elem.get_text().strip()
-                        # Extract numeric value
-                        price_match = re.search(r'[\d,]+\.?\d*', price_text.replace(',', ''))
-                        if price_match:
-                            price_float = float(price_match.group())
-                            if self._validate_price(price_float, symbol):
-                                print(f"MarketWatch: Got price {price_float} for {symbol}")
-                                return price_float
-        except Exception as e:
-            print(f"MarketWatch error for {symbol}: {e}")
-        return None
-    
-    def _retry_with_backoff(self, symbol):
-        """Retry failed APIs with exponential backoff"""
-        try:
-            # Retry the most reliable APIs with delays
-            retry_methods = [
-                ('Yahoo Finance API', self._fetch_yahoo_finance_api),
-                ('NSE Official', self._fetch_nse_official),
-                ('BSE Official', self._fetch_bse_official),
-                ('IndianAPI', self._fetch_indian_api)
-            ]
-            
-            for delay in [1, 2, 4]:  # 1s, 2s, 4s delays
-                time.sleep(delay)
-                for method_name, method_func in retry_methods:
-                    try:
-                        price = method_func(symbol)
-                        if price:
-                            print(f"Retry success with {method_name} after {delay}s delay: {price}")
-                            return price
-                    except Exception as e:
-                        print(f"Retry failed with {method_name}: {e}")
-                        continue
-        except Exception as e:
-            print(f"Retry with backoff error for {symbol}: {e}")
-        return None
-    
     def _emergency_price_fetch(self, symbol):
         """Emergency price fetch using alternative methods"""
         try:
@@ -527,20 +336,15 @@ class StockDataService:
                 f"{symbol}.BSE"
             ]
             
+            nse_primed = False
+            
             # Try each variant with the most reliable methods
             for variant in symbol_variants:
                 # Try Yahoo Finance with different headers
                 try:
                     url = "https://query1.finance.yahoo.com/v7/finance/quote"
                     params = {"symbols": variant}
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-                        "Accept": "application/json",
-                        "Referer": "https://finance.yahoo.com/",
-                        "Accept-Language": "en-US,en;q=0.9"
-                    }
-                    
-                    response = requests.get(url, params=params, headers=headers, timeout=15)
+                    response = self.session.get(url, params=params, headers=YAHOO_HEADERS, timeout=15)
                     if response.status_code == 200:
                         data = response.json()
                         result = data.get("quoteResponse", {}).get("result", [])
@@ -550,27 +354,22 @@ class StockDataService:
                             if price:
                                 price_float = float(price)
                                 if self._validate_price(price_float, symbol):
-                                    print(f"Emergency fetch success with Yahoo Finance for {variant}: {price_float}")
+                                    logger.debug("Emergency fetch success with Yahoo Finance for %s: %s", variant, price_float)
                                     return price_float
                 except Exception as e:
-                    print(f"Emergency Yahoo Finance failed for {variant}: {e}")
+                    logger.warning("Emergency Yahoo Finance failed for %s: %s", variant, e)
                     continue
                 
                 # Try NSE with session
                 try:
-                    session = requests.Session()
-                    session.headers.update({
-                        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-                        'Accept': 'application/json',
-                        'Accept-Language': 'en-US,en;q=0.9'
-                    })
-                    
-                    # Get session first
-                    session.get('https://www.nseindia.com/', timeout=10)
-                    time.sleep(1)  # Small delay
+                    if not nse_primed:
+                        # Get session cookies first (kept on the shared session)
+                        self.session.get('https://www.nseindia.com/', headers=NSE_HEADERS, timeout=10)
+                        time.sleep(1)  # Small delay
+                        nse_primed = True
                     
                     url = f"https://www.nseindia.com/api/quote-equity?symbol={variant}"
-                    response = session.get(url, timeout=15)
+                    response = self.session.get(url, headers=NSE_HEADERS, timeout=15)
                     if response.status_code == 200:
                         data = response.json()
                         price_info = data.get('priceInfo', {})
@@ -578,13 +377,13 @@ class StockDataService:
                         if price:
                             price_float = float(price)
                             if self._validate_price(price_float, symbol):
-                                print(f"Emergency fetch success with NSE for {variant}: {price_float}")
+                                logger.debug("Emergency fetch success with NSE for %s: %s", variant, price_float)
                                 return price_float
                 except Exception as e:
-                    print(f"Emergency NSE failed for {variant}: {e}")
+                    logger.warning("Emergency NSE failed for %s: %s", variant, e)
                     continue
         except Exception as e:
-            print(f"Emergency price fetch error for {symbol}: {e}")
+            logger.warning("Emergency price fetch error for %s: %s", symbol, e)
         return None
     
     def _is_market_open(self):
@@ -608,7 +407,7 @@ class StockDataService:
             
             return is_weekday and market_open <= current_time <= market_close
         except Exception as e:
-            print(f"Error checking market status: {e}")
+            logger.warning("Error checking market status: %s", e)
             return True  # Assume market is open if we can't determine
     
     def _validate_price(self, price, symbol):
@@ -616,20 +415,10 @@ class StockDataService:
         if not price or price <= 0:
             return False
         
-        # Basic validation - stock prices should be between 1 and 100000
-        if price < 1 or price > 100000:
-            return False
-        
-        # Symbol-specific validation
-        symbol_upper = symbol.upper()
-        if symbol_upper == 'RELIANCE' and (price < 1000 or price > 5000):
-            return False
-        elif symbol_upper == 'TCS' and (price < 2000 or price > 6000):
-            return False
-        elif symbol_upper == 'INFY' and (price < 1000 or price > 3000):
-            return False
-        
-        return True
+        # Basic validation - stock prices should be between 1 and 100000, with
+        # tighter bounds for a few well-known symbols
+        low, high = PRICE_BOUNDS.get(symbol.upper(), DEFAULT_PRICE_BOUNDS)
+        return low <= price <= high
     
     def get_stock_history(self, symbol, period='1y', interval='1d'):
         """
@@ -661,15 +450,7 @@ class StockDataService:
                         "interval": interval,
                         "range": yf_period
                     }
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                        "Accept": "application/json",
-                        "Accept-Language": "en-US,en;q=0.9",
-                        "Referer": "https://finance.yahoo.com/",
-                        "Origin": "https://finance.yahoo.com"
-                    }
-                    
-                    response = requests.get(url, params=params, headers=headers, timeout=15, verify=False)
+                    response = self.session.get(url, params=params, headers=YAHOO_HEADERS, timeout=15, verify=False)
                     
                     if response.status_code == 200:
                         data = response.json()
@@ -737,7 +518,7 @@ class StockDataService:
                     'token': self.finnhub_key
                 }
                 
-                response = requests.get(url, params=params, timeout=15)
+                response = self.session.get(url, params=params, timeout=15)
                 if response.status_code == 200:
                     data = response.json()
                     if data.get('s') == 'ok' and data.get('c'):
@@ -766,6 +547,7 @@ class StockDataService:
     def get_market_indices(self):
         """Get market indices with caching and market status"""
         cache_key = "market_indices"
+        stale_key = "market_indices_stale"
         cached_data = cache.get(cache_key)
         if cached_data:
             return cached_data
@@ -775,56 +557,38 @@ class StockDataService:
         
         # Try to get real market indices
         try:
-            # NIFTY 50
-            print(f"=== Fetching NIFTY data ===")
-            nifty_data = self._fetch_market_index('NIFTY')
-            if nifty_data:
-                print(f"NIFTY: Got real data: {nifty_data}")
-                indices['NIFTY'] = nifty_data
-            else:
-                print(f"NIFTY: Using fallback data")
-                # Use current realistic values based on Groww data
-                indices['NIFTY'] = {'price': 24836.30, 'change': 225.20, 'change_percent': 0.92}
-            
-            # SENSEX
-            print(f"=== Fetching SENSEX data ===")
-            sensex_data = self._fetch_market_index('SENSEX')
-            if sensex_data:
-                print(f"SENSEX: Got real data: {sensex_data}")
-                indices['SENSEX'] = sensex_data
-            else:
-                print(f"SENSEX: Using fallback data")
-                indices['SENSEX'] = {'price': 80983.31, 'change': 715.69, 'change_percent': 0.89}
-            
-            # BANKNIFTY
-            print(f"=== Fetching BANKNIFTY data ===")
-            banknifty_data = self._fetch_market_index('BANKNIFTY')
-            if banknifty_data:
-                print(f"BANKNIFTY: Got real data: {banknifty_data}")
-                indices['BANKNIFTY'] = banknifty_data
-            else:
-                print(f"BANKNIFTY: Using fallback data")
-                indices['BANKNIFTY'] = {'price': 55347.95, 'change': 712.10, 'change_percent': 1.30}
+            # Last successfully fetched values, preferred over the static fallbacks
+            stale = cache.get(stale_key) or {}
+            live = {}
+            
+            deadline = time.monotonic() + INDEX_FETCH_BUDGET
+            
+            # One NSE request covers every NSE index; only misses go on to Yahoo
+            nse_indices = self._fetch_nse_indices()
+            fetch_index = partial(self._fetch_market_index, nse_indices=nse_indices, deadline=deadline)
+            
+            # Each index is an independent, I/O bound lookup; fetch them concurrently
+            with ThreadPoolExecutor(max_workers=len(MARKET_INDEX_FALLBACKS)) as executor:
+                results = executor.map(fetch_index, MARKET_INDEX_FALLBACKS)
+                for index_name, index_data in zip(MARKET_INDEX_FALLBACKS, results):
+                    if index_data:
+                        logger.debug("%s: Got real data: %s", index_name, index_data)
+                        live[index_name] = index_data
+                        indices[index_name] = index_data
+                    elif index_name in stale:
+                        logger.debug("%s: Using last known data", index_name)
+                        indices[index_name] = stale[index_name]
+                    else:
+                        logger.debug("%s: Using fallback data", index_name)
+                        indices[index_name] = MARKET_INDEX_FALLBACKS[index_name]
             
-            # MIDCPNIFTY
-            print(f"=== Fetching MIDCPNIFTY data ===")
-            midcpnifty_data = self._fetch_market_index('MIDCPNIFTY')
-            if midcpnifty_data:
-                print(f"MIDCPNIFTY: Got real data: {midcpnifty_data}")
-                indices['MIDCPNIFTY'] = midcpnifty_data
-            else:
-                print(f"MIDCPNIFTY: Using fallback data")
-                indices['MIDCPNIFTY'] = {'price': 12698.15, 'change': 98.90, 'change_percent': 0.78}
+            if live:
+                cache.set(stale_key, {**stale, **live}, 3600)
                 
         except Exception as e:
-            logger.error(f"Error fetching market indices: {e}")
+            logger.error("Error fetching market indices: %s", e)
             # Fallback to current realistic market values
-            indices = {
-                'NIFTY': {'price': 24836.30, 'change': 225.20, 'change_percent': 0.92},
-                'SENSEX': {'price': 80983.31, 'change': 715.69, 'change_percent': 0.89},
-                'BANKNIFTY': {'price': 55347.95, 'change': 712.10, 'change_percent': 1.30},
-                'MIDCPNIFTY': {'price': 12698.15, 'change': 98.90, 'change_percent': 0.78}
-            }
+            indices = dict(MARKET_INDEX_FALLBACKS)
         
         # Add market status to the response
         result = {
@@ -889,50 +653,44 @@ class StockDataService:
                 'next_open': 'Check market hours'
             }
     
-    def _fetch_market_index(self, index_name):
-        """Fetch specific market index data from NSE API"""
+    def _fetch_market_index(self, index_name, nse_indices=None, deadline=None):
+        """Fetch specific market index data from NSE API
+        
+        nse_indices: optional table from _fetch_nse_indices(), so callers fetching
+        several indices can share a single NSE request
+        deadline: optional time.monotonic() value after which no further
+        fallback requests are started
+        """
         try:
             # Try NSE API first (most reliable for Indian markets)
-            nse_data = self._fetch_from_nse_api(index_name)
+            if nse_indices is None:
+                nse_indices = self._fetch_nse_indices() if index_name in NSE_INDEX_NAMES else {}
+            nse_data = nse_indices.get(NSE_INDEX_NAMES.get(index_name))
             if nse_data:
-                print(f"NSE API: Got real data for {index_name}: {nse_data}")
-                logger.info(f"NSE API: Got real data for {index_name}: {nse_data}")
+                logger.debug("NSE API: Got real data for %s: %s", index_name, nse_data)
                 return nse_data
             
             # Fallback to Yahoo Finance if NSE fails
-            print(f"NSE API failed for {index_name}, trying Yahoo Finance")
-            logger.warning(f"NSE API failed for {index_name}, trying Yahoo Finance")
-            
-            symbol_variants = {
-                'NIFTY': ['^NSEI', 'NIFTY.NS'],
-                'SENSEX': ['^BSESN', 'SENSEX.BO'],
-                'BANKNIFTY': ['^NSEBANK', 'BANKNIFTY.NS'],
-                'MIDCPNIFTY': ['^CNXMDCP', 'MIDCPNIFTY.NS']
-            }
+            logger.warning("NSE API failed for %s, trying Yahoo Finance", index_name)
             
-            variants = symbol_variants.get(index_name, [index_name])
+            variants = INDEX_YAHOO_SYMBOLS.get(index_name, (index_name,))
             
             for symbol in variants:
+                if deadline is not None and time.monotonic() > deadline:
+                    logger.warning("Index fetch budget exhausted before trying %s for %s", symbol, index_name)
+                    break
                 try:
                     url = "https://query1.finance.yahoo.com/v7/finance/quote"
                     params = {"symbols": symbol}
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                        "Accept": "application/json",
-                        "Referer": "https://finance.yahoo.com/"
-                    }
                     
-                    print(f"Fetching {index_name} with symbol {symbol}")
-                    logger.info(f"Fetching {index_name} with symbol {symbol}")
-                    response = requests.get(url, params=params, headers=headers, timeout=10)
-                    print(f"Response status: {response.status_code}")
-                    logger.info(f"Response status: {response.status_code}")
+                    logger.debug("Fetching %s with symbol %s", index_name, symbol)
+                    response = self.session.get(url, params=params, headers=YAHOO_HEADERS, timeout=INDEX_REQUEST_TIMEOUT)
+                    logger.debug("Response status: %s", response.status_code)
                     
                     if response.status_code == 200:
                         data = response.json()
                         result = data.get("quoteResponse", {}).get("result", [])
-                        print(f"Result length: {len(result)}")
-                        logger.info(f"Result length: {len(result)}")
+                        logger.debug("Result length: %s", len(result))
                         
                         if result:
                             item = result[0]
@@ -940,8 +698,7 @@ class StockDataService:
                             change = item.get("regularMarketChange")
                             change_percent = item.get("regularMarketChangePercent")
                             
-                            print(f"Price: {price}, Change: {change}, Change%: {change_percent}")
-                            logger.info(f"Price: {price}, Change: {change}, Change%: {change_percent}")
+                            logger.debug("Price: %s, Change: %s, Change%%: %s", price, change, change_percent)
                             
                             if price and change is not None and change_percent is not None:
                                 return {
@@ -950,95 +707,63 @@ class StockDataService:
                                     'change_percent': float(change_percent)
                                 }
                         else:
-                            print(f"No data in response for {symbol}")
-                            logger.warning(f"No data in response for {symbol}")
+                            logger.warning("No data in response for %s", symbol)
                     elif response.status_code == 401:
-                        print(f"Yahoo Finance API: Unauthorized (401) for {symbol} - may be rate limited or blocked")
-                        logger.warning(f"Yahoo Finance API: Unauthorized (401) for {symbol} - may be rate limited or blocked")
+                        logger.warning("Yahoo Finance API: Unauthorized (401) for %s - may be rate limited or blocked", symbol)
                     elif response.status_code == 403:
-                        print(f"Yahoo Finance API: Forbidden (403) for {symbol} - may be blocked")
-                        logger.warning(f"Yahoo Finance API: Forbidden (403) for {symbol} - may be blocked")
+                        logger.warning("Yahoo Finance API: Forbidden (403) for %s - may be blocked", symbol)
                     else:
-                        print(f"HTTP error {response.status_code} for {symbol}")
-                        logger.warning(f"HTTP error {response.status_code} for {symbol}")
+                        logger.warning("HTTP error %s for %s", response.status_code, symbol)
                 except Exception as e:
-                    print(f"Yahoo Finance error for {symbol}: {e}")
-                    logger.error(f"Yahoo Finance error for {symbol}: {e}")
+                    logger.error("Yahoo Finance error for %s: %s", symbol, e)
                     continue
                     
         except Exception as e:
-            logger.error(f"Error fetching {index_name}: {e}")
+            logger.error("Error fetching %s: %s", index_name, e)
             
         return None
     
-    def _fetch_from_nse_api(self, index_name):
-        """Fetch data from NSE API - most reliable for Indian markets"""
+    def _fetch_nse_indices(self):
+        """Fetch all index quotes from the NSE API in one request
+        
+        Returns a dict keyed by NSE index name (e.g. 'NIFTY 50'); empty on failure.
+        """
+        indices = {}
         try:
-            # NSE API mapping (SENSEX is BSE, not NSE)
-            nse_mapping = {
-                'NIFTY': 'NIFTY 50',
-                'BANKNIFTY': 'NIFTY BANK',
-                'MIDCPNIFTY': 'NIFTY MIDCAP 100'
-            }
-            
-            nse_symbol = nse_mapping.get(index_name)
-            if not nse_symbol:
-                return None
-            
             url = "https://www.nseindia.com/api/allIndices"
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                "Accept": "application/json",
-                "Accept-Language": "en-US,en;q=0.9",
-                "Connection": "keep-alive",
-                "Referer": "https://www.nseindia.com/"
-            }
             
-            print(f"NSE API: Fetching {index_name} ({nse_symbol})")
-            logger.info(f"NSE API: Fetching {index_name} ({nse_symbol})")
+            logger.debug("NSE API: Fetching all indices")
             
-            response = requests.get(url, headers=headers, timeout=15)
-            print(f"NSE API Response status: {response.status_code}")
-            logger.info(f"NSE API Response status: {response.status_code}")
+            response = self.session.get(url, headers=NSE_HEADERS, timeout=INDEX_REQUEST_TIMEOUT)
+            logger.debug("NSE API Response status: %s", response.status_code)
             
             if response.status_code == 200:
                 data = response.json()
-                indices = data.get('data', [])
                 
-                # Find the specific index
-                for index_data in indices:
-                    if index_data.get('index') == nse_symbol:
-                        price = index_data.get('last', 0)
-                        change = index_data.get('variation', 0)
-                        change_percent = index_data.get('percentChange', 0)
-                        
-                        print(f"NSE API: Found {nse_symbol} - Price: {price}, Change: {change}, Change%: {change_percent}")
-                        logger.info(f"NSE API: Found {nse_symbol} - Price: {price}, Change: {change}, Change%: {change_percent}")
-                        
-                        if price and price > 0:
-                            return {
-                                'price': float(price),
-                                'change': float(change),
-                                'change_percent': float(change_percent)
-                            }
+                for index_data in data.get('data', []):
+                    price = index_data.get('last')
+                    # A flat index legitimately reports 0 (or null) change at the open
+                    change = index_data.get('variation')
+                    change_percent = index_data.get('percentChange')
+                    if price is not None and price > 0:
+                        indices[index_data.get('index')] = {
+                            'price': float(price),
+                            'change': float(change) if change is not None else 0.0,
+                            'change_percent': float(change_percent) if change_percent is not None else 0.0
+                        }
                 
-                print(f"NSE API: Index {nse_symbol} not found in response")
-                logger.warning(f"NSE API: Index {nse_symbol} not found in response")
+                logger.debug("NSE API: Got %s indices", len(indices))
             elif response.status_code == 401:
-                print(f"NSE API: Unauthorized (401) for {nse_symbol} - may be rate limited or blocked")
-                logger.warning(f"NSE API: Unauthorized (401) for {nse_symbol} - may be rate limited or blocked")
+                logger.warning("NSE API: Unauthorized (401) - may be rate limited or blocked")
             elif response.status_code == 403:
-                print(f"NSE API: Forbidden (403) for {nse_symbol} - may be blocked")
-                logger.warning(f"NSE API: Forbidden (403) for {nse_symbol} - may be blocked")
+                logger.warning("NSE API: Forbidden (403) - may be blocked")
             else:
-                print(f"NSE API: HTTP error {response.status_code}")
-                logger.warning(f"NSE API: HTTP error {response.status_code}")
+                logger.warning("NSE API: HTTP error %s", response.status_code)
                 
         except Exception as e:
-            print(f"NSE API error for {index_name}: {e}")
-            logger.error(f"NSE API error for {index_name}: {e}")
+            logger.error("NSE API error: %s", e)
             
-        return None
+        return indices
 
     def parse_intent(self, text):
         """
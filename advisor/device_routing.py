@@ -2,6 +2,9 @@ from django.utils.deprecation import MiddlewareMixin
 from django.shortcuts import redirect
 from django.http import HttpResponseRedirect
 import re
+import logging
+
+logger = logging.getLogger(__name__)
 
 class DeviceDetectionMiddleware(MiddlewareMixin):
     """Middleware to detect device type and route accordingly"""
@@ -19,18 +22,18 @@ class DeviceDetectionMiddleware(MiddlewareMixin):
         self.mobile_service_url = os.environ.get('MOBILE_SERVICE_URL')
         
         # Debug logging
-        print(f"DEBUG: MOBILE_SERVICE_URL = {self.mobile_service_url}")
+        logger.debug("MOBILE_SERVICE_URL = %s", self.mobile_service_url)
         
         # Only proceed with mobile redirection if mobile service URL is configured
         if not self.mobile_service_url:
             # No mobile service configured, skip redirection
             request.is_mobile = False
-            print("DEBUG: No mobile service URL configured, skipping redirection")
+            logger.debug("No mobile service URL configured, skipping redirection")
             return None
         
         # Get user agent
         user_agent = request.META.get('HTTP_USER_AGENT', '').lower()
-        print(f"DEBUG: User Agent = {user_agent}")
+        logger.debug("User Agent = %s", user_agent)
         
         # Mobile device patterns
         mobile_patterns = [
@@ -40,7 +43,7 @@ class DeviceDetectionMiddleware(MiddlewareMixin):
         
         # Check if it's a mobile device
         is_mobile = any(pattern in user_agent for pattern in mobile_patterns)
-        print(f"DEBUG: Is mobile device = {is_mobile}")
+        logger.debug("Is mobile device = %s", is_mobile)
         
         # Check for manual override in URL parameters
         if 'mobile' in request.GET:
@@ -80,7 +83,7 @@ class DeviceDetectionMiddleware(MiddlewareMixin):
             if clean_params:
                 redirect_url += f"?{request.GET.urlencode()}"
             
-            print(f"DEBUG: Redirecting mobile user to {redirect_url}")
+            logger.debug("Redirecting mobile user to %s", redirect_url)
             
             # Create a clean redirect response that clears any existing CSRF tokens
             response = HttpResponseRedirect(redirect_url)
@@ -95,5 +98,5 @@ class DeviceDetectionMiddleware(MiddlewareMixin):
             
             return response
         
-        print(f"DEBUG: No redirect needed - is_mobile={is_mobile}, path={request.path}")
+        logger.debug("No redirect needed - is_mobile=%s, path=%s", is_mobile, request.path)
         return None
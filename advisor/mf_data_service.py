@@ -24,6 +24,8 @@ class MutualFundDataService:
         
         # Comprehensive Indian mutual fund database (fallback)
         self.fund_database = self._load_fund_database()
+        # Index by scheme ID so lookups don't scan the whole database
+        self.funds_by_id = {str(fund['scheme_id']): fund for fund in self.fund_database}
         logger.info(f"Loaded {len(self.fund_database)} funds into database")
     
     def _load_fund_database(self):
@@ -265,6 +267,42 @@ class MutualFundDataService:
         scored_funds.sort(key=lambda x: x['score'], reverse=True)
         return [item['fund'] for item in scored_funds[:8]]
     
+    def get_funds_by_ids(self, scheme_ids):
+        """
+        Get several funds at once; returns {scheme_id: fund} for the IDs that were found.
+        Local funds come straight from the in-memory index, the rest via get_fund_by_id.
+        IDs that no source knows (usually stock tickers) are remembered for cache_timeout
+        so repeat portfolio requests don't search the remote sources for them again.
+        """
+        funds = {}
+        lookups = []
+        for scheme_id in scheme_ids:
+            fund = self.funds_by_id.get(str(scheme_id))
+            if fund:
+                funds[scheme_id] = fund
+            else:
+                lookups.append(scheme_id)
+        
+        if lookups:
+            try:
+                known_missing = cache.get_many([f"mf_fund_missing_{scheme_id}" for scheme_id in lookups])
+            except Exception:
+                known_missing = {}
+            
+            for scheme_id in lookups:
+                missing_key = f"mf_fund_missing_{scheme_id}"
+                if missing_key in known_missing:
+                    continue
+                fund = self.get_fund_by_id(scheme_id)
+                if fund:
+                    funds[scheme_id] = fund
+                else:
+                    try:
+                        cache.set(missing_key, True, self.cache_timeout)
+                    except Exception:
+                        pass
+        return funds
+    
     def get_fund_by_id(self, scheme_id):
         """
         Get specific mutual fund by scheme ID from multiple sources.
@@ -279,14 +317,14 @@ class MutualFundDataService:
             pass
 
         # 1. Search local database first
-        for fund in self.fund_database:
-            if str(fund['scheme_id']) == str(scheme_id):
-                logger.info(f"Found fund {scheme_id} in local database.")
-                try:
-                    cache.set(cache_key, fund, self.cache_timeout)
-                except Exception:
-                    pass
-                return fund
+        fund = self.funds_by_id.get(str(scheme_id))
+        if fund:
+            logger.info(f"Found fund {scheme_id} in local database.")
+            try:
+                cache.set(cache_key, fund, self.cache_timeout)
+            except Exception:
+                pass
+            return fund
 
         # 2. If not in local DB, try Yahoo Finance search
         logger.info(f"Fund {scheme_id} not in local DB, searching Yahoo Finance...")
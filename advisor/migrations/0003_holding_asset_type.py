@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-17 01:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advisor', '0002_portfolio_holding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='holding',
+            name='asset_type',
+            field=models.CharField(blank=True, choices=[('stock', 'Stock'), ('mf', 'Mutual Fund')], help_text='Set when the holding is added; empty for older rows', max_length=10, null=True),
+        ),
+    ]
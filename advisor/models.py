@@ -29,10 +29,16 @@ class Portfolio(models.Model):
         return f"{self.user.username}'s Portfolio"
 
 class Holding(models.Model):
+    ASSET_TYPE_CHOICES = [
+        ('stock', 'Stock'),
+        ('mf', 'Mutual Fund'),
+    ]
+
     portfolio = models.ForeignKey(Portfolio, on_delete=models.CASCADE, related_name='holdings')
     ticker = models.CharField(max_length=20)
     quantity = models.PositiveIntegerField()
     average_buy_price = models.DecimalField(max_digits=10, decimal_places=2)
+    asset_type = models.CharField(max_length=10, choices=ASSET_TYPE_CHOICES, null=True, blank=True, help_text="Set when the holding is added; empty for older rows")
 
     def __str__(self):
         return f"{self.quantity} shares of {self.ticker} in {self.portfolio.user.username}'s portfolio"
@@ -3,7 +3,8 @@ API endpoints for conversational AI chat functionality
 Simple marker-based redirection (no function calling complexity)
 """
 
-from rest_framework.decorators import api_view, permission_classes
+from django.views.decorators.gzip import gzip_page
+from rest_framework.decorators import api_view, permission_classes, parser_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
@@ -12,12 +13,22 @@ import re
 
 from advisor.nlp_service import ConversationalAI
 from .data_service import StockDataService as DataService
+from .renderers import ORJSONParser, ORJSONRenderer
 
 logger = logging.getLogger(__name__)
 
+# Redirection markers the advisor embeds in its reply, in the order they are applied
+_REDIRECTION_MARKERS = (
+    (re.compile(r'\[STOCK_ANALYSIS:([^\]]+)\]\s*'), 'stock'),
+    (re.compile(r'\[MF_ANALYSIS:([^\]]+)\]\s*'), 'mutual_fund'),
+)
 
+
+@gzip_page
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@parser_classes([ORJSONParser])
+@renderer_classes([ORJSONRenderer])
 def chat_message(request):
     """
     Handle chat messages with Gemini, using its intent parsing capabilities.
@@ -74,8 +85,11 @@ def chat_message(request):
 
 
 
+@gzip_page
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@parser_classes([ORJSONParser])
+@renderer_classes([ORJSONRenderer])
 def advisor_response(request):
     """
     Get a personalized advisor response for a user query.
@@ -110,19 +124,13 @@ def advisor_response(request):
         redirection_target = None
         has_redirection = False
 
-        stock_match = re.search(r'\[STOCK_ANALYSIS:([^\]]+)\]', advisor_response)
-        if stock_match:
-            redirection_type = 'stock'
-            redirection_target = stock_match.group(1).strip()
-            has_redirection = True
-            advisor_response = re.sub(r'\[STOCK_ANALYSIS:[^\]]+\]\s*', '', advisor_response).strip()
-
-        mf_match = re.search(r'\[MF_ANALYSIS:([^\]]+)\]', advisor_response)
-        if mf_match:
-            redirection_type = 'mutual_fund'
-            redirection_target = mf_match.group(1).strip()
-            has_redirection = True
-            advisor_response = re.sub(r'\[MF_ANALYSIS:[^\]]+\]\s*', '', advisor_response).strip()
+        for marker_re, marker_type in _REDIRECTION_MARKERS:
+            match = marker_re.search(advisor_response)
+            if match:
+                redirection_type = marker_type
+                redirection_target = match.group(1).strip()
+                has_redirection = True
+                advisor_response = marker_re.sub('', advisor_response).strip()
 
         return Response({
             'response': advisor_response,
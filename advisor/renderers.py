@@ -0,0 +1,42 @@
+# advisor/renderers.py
+from decimal import Decimal
+
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+
+
+# Shared with the ojson() helper in views so both encoders behave the same
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+
+def orjson_default(obj):
+    """Serialize the few non-native types orjson rejects (Decimal from the ORM)."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+class ORJSONRenderer(BaseRenderer):
+    """DRF renderer that emits JSON with orjson instead of the stdlib encoder."""
+    media_type = "application/json"
+    format = "json"
+    charset = None
+    options = ORJSON_OPTIONS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=orjson_default, option=self.options)
+
+
+class ORJSONParser(BaseParser):
+    """DRF parser that decodes JSON request bodies with orjson."""
+    media_type = "application/json"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,40 @@
+# advisor/signals.py
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Holding, Portfolio
+
+
+def _portfolio_version_key(user_id):
+    return f"portfolio_version_{user_id}"
+
+
+def portfolio_version(user_id):
+    """Current holdings version for a user; changes whenever a holding is written"""
+    return cache.get(_portfolio_version_key(user_id), 0)
+
+
+def bump_portfolio_version(user_id):
+    """Invalidate everything cached against the user's current holdings"""
+    key = _portfolio_version_key(user_id)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr(); restart the count
+        cache.set(key, 1, None)
+
+
+@receiver(post_save, sender=Holding)
+@receiver(post_delete, sender=Holding)
+def holding_changed(sender, instance, **kwargs):
+    # PortfolioView hands over holdings with their (already loaded) portfolio attached
+    if Holding.portfolio.is_cached(instance):
+        user_id = instance.portfolio.user_id
+    else:
+        user_id = Portfolio.objects.filter(pk=instance.portfolio_id).values_list("user_id", flat=True).first()
+    if user_id is not None:
+        # After commit, so a concurrent reader can't cache the old holdings under the new version
+        transaction.on_commit(lambda: bump_portfolio_version(user_id))
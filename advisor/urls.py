@@ -3,6 +3,7 @@ from . import views   # import whole views module for function-based views
 
 from .views import (
     PortfolioView,
+    PortfolioDetailsView,
     MarketSnapshotView,
     ParseIntentView,
     ChatView,
@@ -36,7 +37,7 @@ urlpatterns = [
     # Portfolio Management Endpoints
     path("portfolio/", PortfolioView.as_view(), name="portfolio-add-update"),
     path("portfolio/health/", PortfolioHealthView.as_view(), name="portfolio-health"),
-    path("portfolio/details/", PortfolioView.as_view(), name="portfolio-details"),
+    path("portfolio/details/", PortfolioDetailsView.as_view(), name="portfolio-details"),
 
     # Mutual Fund Endpoints
     path("mutual-fund/", MutualFundView.as_view(), name="mutual-fund"),
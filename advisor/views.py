@@ -1,244 +1,403 @@
 import requests
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.gzip import gzip_page
 from django.utils.decorators import method_decorator
+from django.core.cache import cache
+from django.views.decorators.cache import cache_page
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count, Avg
+from django.db import transaction
+from django.db.models import Count, Avg, F, DecimalField, ExpressionWrapper
 from .models import Holding, Portfolio
-from .data_service import stock_data_service
+from .data_service import stock_data_service, YAHOO_HEADERS
 from .mf_data_service import mf_data_service
+from .renderers import ORJSON_OPTIONS, orjson_default
+from .signals import portfolio_version
 import json
+import os
 import random
 import math
+import time
 import re
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from decimal import Decimal
+import orjson
+import numpy as np
+import hashlib
+from functools import lru_cache, wraps
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from bisect import bisect_left, bisect_right
+
+# Optional Gemini integration for general chat; resolved once at import, since a failed
+# import is retried (and the filesystem searched again) every time it is attempted
+try:
+    from .gemini_service import gemini_service
+except ImportError:
+    gemini_service = None
 
 logger = logging.getLogger(__name__)
 
+def ojson(data, status=200):
+    """JsonResponse equivalent backed by orjson"""
+    return HttpResponse(
+        orjson.dumps(data, default=orjson_default, option=ORJSON_OPTIONS),
+        content_type="application/json",
+        status=status
+    )
+
+
+def _err(body, status):
+    """Error response from one of the pre-encoded _ERR_* bodies"""
+    return HttpResponse(body, content_type="application/json", status=status)
+
+
+# Fixed error bodies, encoded once
+_ERR_AUTH_REQUIRED = orjson.dumps({"error": "Authentication required"})
+_ERR_INVALID_DATA = orjson.dumps({"error": "Invalid data"})
+_ERR_INVALID_PAYLOAD = orjson.dumps({"error": "Invalid payload"})
+_ERR_TICKER_REQUIRED = orjson.dumps({"error": "Ticker is required"})
+_ERR_PORTFOLIO_NOT_FOUND = orjson.dumps({"error": "Portfolio not found"})
+_ERR_MESSAGE_REQUIRED = orjson.dumps({"error": "Message is required"})
+
+
+def _keyword_re(*keywords, whole_words=False):
+    """Compile keywords into one alternation matching any of them as a substring,
+    or only as whole words/phrases when `whole_words` is set"""
+    pattern = "|".join(map(re.escape, keywords))
+    return re.compile(rf"\b(?:{pattern})\b" if whole_words else pattern)
+
+
+def _match_intent(text, table, default):
+    """Return (intent, confidence) of the first table entry whose matcher hits `text`"""
+    for intent, confidence, matcher in table:
+        if matcher.search(text):
+            return intent, confidence
+    return default
+
+
+def _mock_rng(*parts):
+    """Random source for mock histories, seeded by `parts` and today's date so a mock
+    regenerated after the page cache expires has the same body, and so the same
+    body-derived ETag, as the one served earlier that day"""
+    seed = hashlib.blake2s("|".join((*parts, date.today().isoformat())).encode(), digest_size=8).digest()
+    return np.random.default_rng(int.from_bytes(seed, "big"))
+
+
+@lru_cache(maxsize=32)
+def _iso_date_range(start, count):
+    """Return `count` consecutive ISO date strings beginning at the date `start`.
+
+    Memoized: every mock history built on the same day asks for the same few ranges.
+    The result is a shared tuple, so callers must not expect to mutate it"""
+    first = start.toordinal()
+    return tuple(date.fromordinal(o).isoformat() for o in range(first, first + count))
+
 # =====================
 # Portfolio Management
 # =====================
 
+# quantity * average_buy_price, computed by the database
+_INVESTED_EXPR = ExpressionWrapper(
+    F('quantity') * F('average_buy_price'),
+    output_field=DecimalField(max_digits=20, decimal_places=2)
+)
+
+# Scheme IDs are all letters or start with a three-letter prefix (e.g. HDFCMID001)
+_MF_RE = re.compile(r'[A-Za-z]+$|[A-Za-z]{3}')
+
+
+def _classify_ticker(ticker):
+    """Holding.asset_type for a new ticker: 'mf' if it resolves to a scheme, else 'stock'"""
+    if not _MF_RE.match(ticker):
+        return 'stock'
+    try:
+        return 'mf' if mf_data_service.get_funds_by_ids([ticker]) else 'stock'
+    except Exception as e:
+        # Leave it unclassified; pricing falls back to the heuristic
+        logger.warning("Error classifying %s: %s", ticker, e)
+        return None
+
+
+def _fetch_current_prices(holdings):
+    """Current price/NAV per ticker for (ticker, asset_type) pairs, one batch per asset type"""
+    # Holdings added before asset_type was recorded fall back to the scheme-ID heuristic
+    mf_ids = [
+        ticker for ticker, asset_type in holdings
+        if asset_type == 'mf' or (asset_type is None and _MF_RE.match(ticker))
+    ]
+    try:
+        prices = {scheme_id: fund['nav'] for scheme_id, fund in mf_data_service.get_funds_by_ids(mf_ids).items()}
+    except Exception as e:
+        logger.warning("Error fetching MF NAVs for %s: %s", mf_ids, e)
+        prices = {}
+    
+    # Stocks, plus any fund no source could price
+    prices.update(stock_data_service.get_stock_prices([ticker for ticker, _ in holdings if ticker not in prices]))
+    return prices
+
 @method_decorator(csrf_exempt, name="dispatch")
 class PortfolioView(View):
     def get(self, request):
         if not request.user.is_authenticated:
-            return JsonResponse({"error": "Authentication required"}, status=401)
-        
-        from decimal import Decimal
+            return _err(_ERR_AUTH_REQUIRED, 401)
         
-        holdings = Holding.objects.filter(portfolio__user=request.user)
-        total_value = sum(Decimal(h.quantity) * h.average_buy_price for h in holdings)
-        
-        # Check if this is a details request (for portfolio page)
-        if request.path.endswith('/details/'):
-            holdings_data = []
-            total_current_value = 0
-            
-            for h in holdings:
-                # Fetch real-time current price
-                current_price = self._fetch_current_price(h.ticker)
-                current_value = Decimal(h.quantity) * Decimal(str(current_price))
-                net_profit = current_value - (Decimal(h.quantity) * h.average_buy_price)
-                total_current_value += float(current_value)
-                
-                holdings_data.append({
-                    "ticker": h.ticker,
-                    "quantity": h.quantity,
-                    "average_buy_price": float(h.average_buy_price),
-                    "current_price": current_price,
-                    "current_value": float(current_value),
-                    "net_profit": float(net_profit)
-                })
-            
-            return JsonResponse({
-                "holdings": holdings_data,
-                "total_invested": float(total_value),
-                "total_current_value": total_current_value,
-                "net_profit": total_current_value - float(total_value)
-            })
+        # Plain dict rows: the payload below never needs model instances
+        holdings = list(Holding.objects.filter(portfolio__user=request.user).values(
+            'ticker', 'quantity', 'average_buy_price', invested=_INVESTED_EXPR
+        ))
         
-        # Default response for other portfolio requests
-        return JsonResponse({
+        # ojson encodes the Decimals
+        return ojson({
             "holdings": [
                 {
-                    "ticker": h.ticker,
-                    "quantity": h.quantity,
-                    "buy_price": float(h.average_buy_price),
-                    "current_value": float(Decimal(h.quantity) * h.average_buy_price)
+                    "ticker": h['ticker'],
+                    "quantity": h['quantity'],
+                    "buy_price": h['average_buy_price'],
+                    "current_value": h['invested']
                 }
                 for h in holdings
             ],
-            "total_value": float(total_value)
+            "total_value": sum((h['invested'] for h in holdings), Decimal('0'))
         })
     
     def post(self, request):
         if not request.user.is_authenticated:
-            return JsonResponse({"error": "Authentication required"}, status=401)
+            return _err(_ERR_AUTH_REQUIRED, 401)
         
         try:
-            from decimal import Decimal
-            
-            data = json.loads(request.body.decode("utf-8"))
+            data = orjson.loads(request.body)
             ticker = data.get("ticker", "").upper()
             quantity = int(data.get("quantity", 0))
             average_buy_price = Decimal(str(data.get("buy_price", 0)))
             
             if not ticker or quantity <= 0 or average_buy_price <= 0:
-                return JsonResponse({"error": "Invalid data"}, status=400)
+                return _err(_ERR_INVALID_DATA, 400)
             
             # Get or create portfolio for user
             portfolio, _ = Portfolio.objects.get_or_create(user=request.user)
             
-            # Check if holding already exists
-            holding, created = Holding.objects.get_or_create(
-                portfolio=portfolio,
-                ticker=ticker,
-                defaults={"quantity": quantity, "average_buy_price": average_buy_price}
-            )
-            
-            if not created:
-                # Update existing holding - use Decimal arithmetic
-                total_quantity = holding.quantity + quantity
-                total_cost = (Decimal(holding.quantity) * holding.average_buy_price) + (Decimal(quantity) * average_buy_price)
-                holding.average_buy_price = total_cost / Decimal(total_quantity)
-                holding.quantity = total_quantity
-                holding.save()
+            # Decide fund vs stock once, here, instead of on every price lookup.
+            # Done before the transaction so no lookup runs while the row is locked
+            asset_type = _classify_ticker(ticker)
             
-            return JsonResponse({"message": "Holding added successfully"})
+            # Lock the row so concurrent adds to the same ticker can't lose an update
+            with transaction.atomic():
+                holding, created = Holding.objects.select_for_update().get_or_create(
+                    portfolio=portfolio,
+                    ticker=ticker,
+                    defaults={"quantity": quantity, "average_buy_price": average_buy_price, "asset_type": asset_type}
+                )
+                
+                if not created:
+                    # Update existing holding - use Decimal arithmetic
+                    total_quantity = holding.quantity + quantity
+                    total_cost = (Decimal(holding.quantity) * holding.average_buy_price) + (Decimal(quantity) * average_buy_price)
+                    holding.average_buy_price = total_cost / Decimal(total_quantity)
+                    holding.quantity = total_quantity
+                    # Already loaded; saves the post_save receiver looking it up again
+                    holding.portfolio = portfolio
+                    update_fields = ["quantity", "average_buy_price"]
+                    if holding.asset_type is None:
+                        # Backfill rows added before asset_type existed
+                        holding.asset_type = asset_type
+                        update_fields.append("asset_type")
+                    holding.save(update_fields=update_fields)
+            
+            return ojson({"message": "Holding added successfully"})
             
         except (json.JSONDecodeError, ValueError, KeyError) as e:
-            return JsonResponse({"error": "Invalid payload"}, status=400)
+            return _err(_ERR_INVALID_PAYLOAD, 400)
         except Exception as e:
-            print(f"Portfolio POST error: {e}")
-            return JsonResponse({"error": f"Failed to add holding: {str(e)}"}, status=500)
-    
-    def _fetch_current_price(self, ticker):
-        """Fetch current price/NAV for stocks and mutual funds"""
-        # Check if it's a mutual fund (scheme IDs typically start with letters)
-        if ticker.isalpha() or (len(ticker) > 3 and ticker[:3].isalpha()):
-            # Try to get mutual fund NAV
-            try:
-                from advisor.mf_data_service import mf_data_service
-                fund = mf_data_service.get_fund_by_id(ticker)
-                if fund:
-                    return fund['nav']
-                else:
-                    # If not found in MF database, try as stock
-                    return stock_data_service.get_stock_price(ticker)
-            except Exception as e:
-                print(f"Error fetching MF NAV for {ticker}: {e}")
-                # Fallback to stock price
-                return stock_data_service.get_stock_price(ticker)
-        else:
-            # Regular stock ticker
-            return stock_data_service.get_stock_price(ticker)
+            logger.error("Portfolio POST error: %s", e)
+            return ojson({"error": f"Failed to add holding: {str(e)}"}, status=500)
     
     def delete(self, request):
         """Remove a holding from portfolio"""
         if not request.user.is_authenticated:
-            return JsonResponse({"error": "Authentication required"}, status=401)
+            return _err(_ERR_AUTH_REQUIRED, 401)
         
         try:
-            data = json.loads(request.body.decode("utf-8"))
+            data = orjson.loads(request.body)
             ticker = data.get("ticker", "").upper()
             
             if not ticker:
-                return JsonResponse({"error": "Ticker is required"}, status=400)
+                return _err(_ERR_TICKER_REQUIRED, 400)
             
             # Get user's portfolio
             try:
                 portfolio = Portfolio.objects.get(user=request.user)
             except Portfolio.DoesNotExist:
-                return JsonResponse({"error": "Portfolio not found"}, status=404)
+                return _err(_ERR_PORTFOLIO_NOT_FOUND, 404)
             
             # Find and delete the holding
             try:
-                holding = Holding.objects.get(portfolio=portfolio, ticker=ticker)
+                holding = portfolio.holdings.get(ticker=ticker)
                 holding.delete()
-                return JsonResponse({"message": f"Holding {ticker} removed successfully"})
+                return ojson({"message": f"Holding {ticker} removed successfully"})
             except Holding.DoesNotExist:
-                return JsonResponse({"error": f"Holding {ticker} not found"}, status=404)
+                return ojson({"error": f"Holding {ticker} not found"}, status=404)
             
         except (json.JSONDecodeError, ValueError, KeyError) as e:
-            return JsonResponse({"error": "Invalid payload"}, status=400)
+            return _err(_ERR_INVALID_PAYLOAD, 400)
         except Exception as e:
-            print(f"Portfolio DELETE error: {e}")
-            return JsonResponse({"error": f"Failed to remove holding: {str(e)}"}, status=500)
+            logger.error("Portfolio DELETE error: %s", e)
+            return ojson({"error": f"Failed to remove holding: {str(e)}"}, status=500)
+
+class PortfolioDetailsView(View):
+    """Holdings valued at current prices, for the portfolio page"""
+    def get(self, request):
+        if not request.user.is_authenticated:
+            return _err(_ERR_AUTH_REQUIRED, 401)
+        
+        holdings = list(Holding.objects.filter(portfolio__user=request.user).values(
+            'ticker', 'quantity', 'average_buy_price', 'asset_type', invested=_INVESTED_EXPR
+        ))
+        
+        # Nothing to price for an empty portfolio
+        if not holdings:
+            return ojson({
+                "holdings": [],
+                "total_invested": 0.0,
+                "total_current_value": 0.0,
+                "net_profit": 0.0
+            })
+        
+        total_invested = sum(h['invested'] for h in holdings)
+        holdings_data = []
+        total_current_paise = 0
+        # Fetch real-time current prices for all holdings at once
+        prices = _fetch_current_prices([(h['ticker'], h['asset_type']) for h in holdings])
+        
+        # Each holding is rounded to whole paise once (value, not unit price); ints after that
+        for h in holdings:
+            current_price = prices[h['ticker']]
+            current_paise = round(h['quantity'] * current_price * 100)
+            total_current_paise += current_paise
+            
+            holdings_data.append({
+                "ticker": h['ticker'],
+                "quantity": h['quantity'],
+                "average_buy_price": h['average_buy_price'],
+                "current_price": current_price,
+                "current_value": current_paise / 100,
+                "net_profit": (current_paise - round(h['invested'] * 100)) / 100
+            })
+        
+        return ojson({
+            "holdings": holdings_data,
+            "total_invested": total_invested,
+            "total_current_value": total_current_paise / 100,
+            "net_profit": (total_current_paise - round(total_invested * 100)) / 100
+        })
 
 # =====================
 # Market snapshot
 # =====================
 
 class MarketSnapshotView(View):
+    # Encoded body and its ETag are shared by every poller for this long
+    _SNAPSHOT_CACHE_KEY = "market_snapshot_payload"
+    _SNAPSHOT_CACHE_TIMEOUT = 15
+    
     def get(self, request):
         """Get market indices using the robust data service"""
-        print("=== MarketSnapshotView: Starting market data fetch ===")
-        
         try:
-            # Get market indices from the robust data service
-            market_data = stock_data_service.get_market_indices()
-            
-            # Handle both old and new response formats
-            if isinstance(market_data, dict) and 'indices' in market_data:
-                indices_data = market_data['indices']
-                market_status = market_data.get('market_status', {})
-            else:
-                # Fallback for old format
-                indices_data = market_data
-                market_status = {}
-            
-            # Convert to the expected format
-            resp = []
-            for index_name, data in indices_data.items():
-                resp.append({
-                    "name": index_name,
-                    "price": data['price'],
-                    "change": data['change'],
-                    "change_percent": data['change_percent']
-                })
-            
-            print(f"MarketSnapshotView: Successfully fetched {len(resp)} indices")
-            return JsonResponse({
-                "indices": resp,
-                "market_status": market_status
-            })
+            cached = cache.get(self._SNAPSHOT_CACHE_KEY)
+            if cached is None:
+                payload = self._build_snapshot()
+                cached = (payload, f'"{hashlib.blake2s(payload).hexdigest()}"')
+                cache.set(self._SNAPSHOT_CACHE_KEY, cached, self._SNAPSHOT_CACHE_TIMEOUT)
+            payload, etag = cached
+            
+            response = HttpResponse(payload, content_type="application/json")
+            response["ETag"] = etag
+            response["Cache-Control"] = "max-age=30"
+            # Clients poll this endpoint; unchanged snapshots are answered with a bodiless 304
+            return get_conditional_response(request, etag=etag, response=response)
             
         except Exception as e:
-            print(f"MarketSnapshotView: Error in get method: {e}")
-            return JsonResponse({
+            logger.error("MarketSnapshotView: Error in get method: %s", e)
+            return ojson({
                 "indices": [],
                 "market_status": {
                     "status": "error",
                     "message": "Unable to fetch market data"
                 }
             })
+    
+    def _build_snapshot(self):
+        """Fetch the indices and encode the snapshot body"""
+        logger.debug("MarketSnapshotView: Starting market data fetch")
+        
+        # Get market indices from the robust data service
+        market_data = stock_data_service.get_market_indices()
+        
+        # Handle both old and new response formats
+        if isinstance(market_data, dict) and 'indices' in market_data:
+            indices_data = market_data['indices']
+            market_status = market_data.get('market_status', {})
+        else:
+            # Fallback for old format
+            indices_data = market_data
+            market_status = {}
+        
+        # Convert to the expected format in one pass over the name-keyed dict
+        resp = [
+            {
+                "name": index_name,
+                "price": data['price'],
+                "change": data['change'],
+                "change_percent": data['change_percent']
+            }
+            for index_name, data in indices_data.items()
+        ]
+
+        logger.debug("MarketSnapshotView: Successfully fetched %d indices", len(resp))
+        return orjson.dumps({
+            "indices": resp,
+            "market_status": market_status
+        }, default=orjson_default, option=ORJSON_OPTIONS)
 
 # =====================
 # Portfolio Health Analysis
 # =====================
 
+# Score tables: bisect_right(thresholds, value) indexes the matching score/label
+_HOLDINGS_THRESHOLDS = (2, 3, 5, 7, 10)
+_HOLDINGS_SCORES = (1, 3, 5, 7, 8, 10)
+_RISK_LABELS = ("high", "high", "moderate", "low", "low", "low")
+_PERFORMANCE_THRESHOLDS = (-20, -10, -5, 0, 5, 10, 15, 20, 30)
+_PERFORMANCE_SCORES = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10)
+_PERFORMANCE_LABELS = (
+    "poor", "poor", "poor", "moderate", "moderate",
+    "good", "good", "excellent", "excellent", "excellent"
+)
+
+
 @method_decorator(csrf_exempt, name="dispatch")
 class PortfolioHealthView(View):
     def get(self, request):
-        print(f"PortfolioHealthView: User authenticated: {request.user.is_authenticated}")
-        print(f"PortfolioHealthView: User: {request.user}")
-        
         try:
             if not request.user.is_authenticated:
-                print("PortfolioHealthView: User not authenticated, returning 401")
-                return JsonResponse({"error": "Authentication required"}, status=401)
-            
-            holdings = Holding.objects.filter(portfolio__user=request.user)
-            print(f"PortfolioHealthView: Found {holdings.count()} holdings for user {request.user}")
-            
-            if not holdings.exists():
-                print("PortfolioHealthView: No holdings found, returning empty portfolio response")
-                return JsonResponse({
+                logger.debug("PortfolioHealthView: User not authenticated, returning 401")
+                return _err(_ERR_AUTH_REQUIRED, 401)
+            
+            # One query for everything below; counts come from the materialized list and
+            # the invested amounts are multiplied out by the database. Named rows, not models
+            holdings = list(Holding.objects.filter(portfolio__user=request.user).annotate(
+                invested=_INVESTED_EXPR
+            ).values_list('ticker', 'quantity', 'asset_type', 'invested', named=True))
+            num_holdings = len(holdings)
+            logger.debug("PortfolioHealthView: Found %d holdings for user %s", num_holdings, request.user)
+            
+            if not holdings:
+                logger.debug("PortfolioHealthView: No holdings found, returning empty portfolio response")
+                return ojson({
                     "overall_score": 0,
                     "diversification": {
                         "score": 0,
@@ -255,99 +414,50 @@ class PortfolioHealthView(View):
                 })
             
             # Calculate portfolio metrics
-            total_invested = Decimal('0')
-            total_current_value = Decimal('0')
+            total_invested = sum(holding.invested for holding in holdings)
+            prices = _fetch_current_prices([(holding.ticker, holding.asset_type) for holding in holdings])
             
-            for holding in holdings:
-                current_price = self._fetch_current_price(holding.ticker)
-                current_value = Decimal(str(current_price)) * holding.quantity
-                invested_value = holding.average_buy_price * holding.quantity
-                
-                total_invested += invested_value
-                total_current_value += current_value
+            # Round each holding's value to whole paise, then sum ints; one Decimal for the total
+            total_current_paise = sum(
+                round(holding.quantity * prices[holding.ticker] * 100) for holding in holdings
+            )
+            total_current_value = Decimal(total_current_paise) / 100
             
             # Calculate performance
             total_profit_loss = total_current_value - total_invested
             performance_percentage = (total_profit_loss / total_invested * 100) if total_invested > 0 else 0
             
-            # Calculate diversification score (0-10)
-            # More holdings = better diversification
-            num_holdings = holdings.count()
-            if num_holdings >= 10:
-                diversification_score = 10
-            elif num_holdings >= 7:
-                diversification_score = 8
-            elif num_holdings >= 5:
-                diversification_score = 7
-            elif num_holdings >= 3:
-                diversification_score = 5
-            elif num_holdings == 2:
-                diversification_score = 3
-            else:
-                diversification_score = 1
-            
-            # Calculate risk score (0-10)
-            # More holdings = lower risk (higher score)
-            # Fewer holdings = higher risk (lower score)
-            if num_holdings >= 10:
-                risk_score = 10
-            elif num_holdings >= 7:
-                risk_score = 8
-            elif num_holdings >= 5:
-                risk_score = 7
-            elif num_holdings >= 3:
-                risk_score = 5
-            elif num_holdings == 2:
-                risk_score = 3
-            else:
-                risk_score = 1
-            
-            # Calculate performance score (0-10)
-            if performance_percentage >= 30:
-                performance_score = 10
-            elif performance_percentage >= 20:
-                performance_score = 9
-            elif performance_percentage >= 15:
-                performance_score = 8
-            elif performance_percentage >= 10:
-                performance_score = 7
-            elif performance_percentage >= 5:
-                performance_score = 6
-            elif performance_percentage >= 0:
-                performance_score = 5
-            elif performance_percentage >= -5:
-                performance_score = 4
-            elif performance_percentage >= -10:
-                performance_score = 3
-            elif performance_percentage >= -20:
-                performance_score = 2
-            else:
-                performance_score = 1
+            # Diversification and risk both improve with the number of holdings;
+            # performance is scored from the overall return
+            holdings_tier = bisect_right(_HOLDINGS_THRESHOLDS, num_holdings)
+            diversification_score = risk_score = _HOLDINGS_SCORES[holdings_tier]
+            performance_tier = bisect_right(_PERFORMANCE_THRESHOLDS, performance_percentage)
+            performance_score = _PERFORMANCE_SCORES[performance_tier]
             
             # Overall score (weighted average: diversification 30%, risk 30%, performance 40%)
             overall_score = (diversification_score * 0.3) + (risk_score * 0.3) + (performance_score * 0.4)
             
-            print(f"PortfolioHealthView: Calculated overall score: {overall_score}")
+            logger.debug("PortfolioHealthView: Calculated overall score: %s", overall_score)
             
-            return JsonResponse({
+            return ojson({
                 "overall_score": round(overall_score, 1),
                 "diversification": {
                     "score": diversification_score,
-                    "feedback": f"Good diversification with {holdings.count()} holdings." if diversification_score >= 6 else f"Consider adding more stocks for better diversification. Currently have {holdings.count()} holdings."
+                    "feedback": f"Good diversification with {num_holdings} holdings." if diversification_score >= 6 else f"Consider adding more stocks for better diversification. Currently have {num_holdings} holdings."
                 },
                 "risk": {
                     "score": risk_score,
-                    "feedback": f"Portfolio risk is {'low' if risk_score >= 7 else 'moderate' if risk_score >= 4 else 'high'} with {holdings.count()} holdings."
+                    "feedback": f"Portfolio risk is {_RISK_LABELS[holdings_tier]} with {num_holdings} holdings."
                 },
                 "performance": {
                     "score": performance_score,
-                    "feedback": f"Portfolio performance is {'excellent' if performance_score >= 8 else 'good' if performance_score >= 6 else 'moderate' if performance_score >= 4 else 'poor'} with {performance_percentage:.1f}% returns."
+                    "feedback": f"Portfolio performance is {_PERFORMANCE_LABELS[performance_tier]} with {performance_percentage:.1f}% returns."
                 }
             })
             
         except Exception as e:
-            print(f"PortfolioHealthView: Error in get method: {e}")
-            return JsonResponse({
+            logger.error("PortfolioHealthView: Error in get method: %s", e)
+            return ojson({
                 "overall_score": 0,
                 "diversification": {
                     "score": 0,
@@ -362,32 +472,31 @@ class PortfolioHealthView(View):
                     "feedback": "Unable to calculate performance due to data error."
                 }
             }, status=500)
-    
-    def _fetch_current_price(self, ticker):
-        """Fetch current price/NAV for stocks and mutual funds"""
-        # Check if it's a mutual fund (scheme IDs typically start with letters)
-        if ticker.isalpha() or (len(ticker) > 3 and ticker[:3].isalpha()):
-            # Try to get mutual fund NAV
-            try:
-                from advisor.mf_data_service import mf_data_service
-                fund = mf_data_service.get_fund_by_id(ticker)
-                if fund:
-                    return fund['nav']
-                else:
-                    # If not found in MF database, try as stock
-                    return stock_data_service.get_stock_price(ticker)
-            except Exception as e:
-                print(f"Error fetching MF NAV for {ticker}: {e}")
-                # Fallback to stock price
-                return stock_data_service.get_stock_price(ticker)
-        else:
-            # Regular stock ticker
-            return stock_data_service.get_stock_price(ticker)
 
 # =====================
 # Mutual Fund Data
 # =====================
 
+@lru_cache(maxsize=64)
+def _mutual_fund_list_payload(category, limit):
+    """Serialized MutualFundView body and its ETag
+    
+    The fund list is the static database loaded by mf_data_service at startup,
+    so each (category, limit) combination only needs encoding once per process.
+    """
+    if category:
+        funds = mf_data_service.get_funds_by_category(category)
+    else:
+        # Get top performing funds by default
+        funds = mf_data_service.get_top_performing_funds(limit=limit)
+    
+    payload = orjson.dumps({
+        "funds": funds[:limit],
+        "total_count": len(funds),
+        "category": category or "All"
+    })
+    return payload, f'"{hashlib.blake2s(payload).hexdigest()}"'
+
 @method_decorator(csrf_exempt, name="dispatch")
 class MutualFundView(View):
     def get(self, request):
@@ -396,123 +505,61 @@ class MutualFundView(View):
             category = request.GET.get('category', '')
             limit = int(request.GET.get('limit', 20))
             
-            if category:
-                funds = mf_data_service.get_funds_by_category(category)
-            else:
-                # Get top performing funds by default
-                funds = mf_data_service.get_top_performing_funds(limit=limit)
-            
-            return JsonResponse({
-                "funds": funds[:limit],
-                "total_count": len(funds),
-                "category": category or "All"
-            })
+            payload, etag = _mutual_fund_list_payload(category, limit)
+            response = HttpResponse(payload, content_type="application/json")
+            response["ETag"] = etag
+            return get_conditional_response(request, etag=etag, response=response)
             
         except Exception as e:
             logger.error(f"MutualFundView error: {e}")
-            return JsonResponse({
+            return ojson({
                 "error": f"Failed to fetch mutual fund data: {str(e)}",
                 "funds": []
             }, status=500)
 
-# =====================
-# Dashboard Views
-# =====================
-
-@login_required
-def dashboard(request):
-    """Main dashboard view"""
-    return render(request, 'advisor/index.html')
-
-# =====================
-# Missing View Functions for URL Configuration
-# =====================
-
-def chat_view(request):
-    """Main chat interface view"""
-    return render(request, 'advisor/index.html', {
-        'user_first_name': request.user.first_name if request.user.is_authenticated else '',
-        'csrf_token_value': request.META.get('CSRF_COOKIE', '')
-    })
-
-def profile_view(request):
-    """User profile view"""
-    return render(request, 'advisor/profile.html')
-
-def about_view(request):
-    """About page view"""
-    return render(request, 'advisor/about.html')
-
-def portfolio_page_view(request):
-    """Portfolio page view"""
-    return render(request, 'advisor/portfolio.html')
-
 # =====================
 # Natural Language Understanding (NLU)
 # =====================
 
+# (intent, confidence, keyword matcher) for ParseIntentView, in priority order
+_PARSE_INTENT_TABLE = (
+    # Mutual fund queries (detect BEFORE checking for just "fund" as part of portfolio queries)
+    ("analyze_mutual_fund", 0.9, _keyword_re("mutual fund", "mutualfund", "mf ", "nav", "scheme", "sip")),
+    # Stock analysis queries (e.g., "analyze tata steel", "buy reliance", "should I sell infy")
+    ("stock_analysis", 0.85, _keyword_re("analyze", "analysis", "should i buy", "should i sell", "buy", "sell", "recommendation")),
+    ("portfolio", 0.9, _keyword_re("portfolio", "holdings", "stocks i own", "my stocks", "investments", "my investments")),
+    # Generic market info, index prices, etc; plain "stock" is too generic to match here
+    ("market_data", 0.9, _keyword_re("market snapshot", "market data", "nifty", "sensex", "banknifty", "index", "indices", "market price", "market close")),
+    ("search", 0.8, _keyword_re("search", "find", "look for", "show me")),
+)
+
 @method_decorator(csrf_exempt, name="dispatch")
 class ParseIntentView(View):
     def post(self, request):
         try:
-            data = json.loads(request.body.decode("utf-8"))
-            text = data.get("text", "").lower()
-            original_text = data.get("text", "")  # Keep original for entity extraction
+            data = orjson.loads(request.body)
+            original_text = data.get("text") or ""  # Keep original for entity extraction
+            text = original_text.casefold()
 
             # Enhanced NLP for better intent detection
-            text_lower = text.strip().lower()
-            
-            # HIGHEST PRIORITY: Stock analysis queries (analyze X, should I buy X, etc)
-            # Mutual fund queries (detect BEFORE checking for just "fund" as part of portfolio queries)
-            if any(word in text_lower for word in ["mutual fund", "mutualfund", "mf ", "nav", "scheme", "sip"]):
-                return JsonResponse({
-                    "intent": "analyze_mutual_fund",
-                    "confidence": 0.9,
-                    "entities": {"query": original_text, "entity": original_text}
-                })
+            text_lower = text.strip()
             
-            # Stock analysis queries (e.g., "analyze tata steel", "buy reliance", "should I sell infy")
-            if any(word in text_lower for word in ["analyze", "analysis", "should i buy", "should i sell", "buy", "sell", "recommendation"]):
-                return JsonResponse({
-                    "intent": "stock_analysis",
-                    "confidence": 0.85,
-                    "entities": {"query": original_text, "entity": original_text}
-                })
-            
-            # Portfolio queries
-            if any(word in text_lower for word in ["portfolio", "holdings", "stocks i own", "my stocks", "investments", "my investments"]):
-                return JsonResponse({
-                    "intent": "portfolio",
-                    "confidence": 0.9,
-                    "entities": {"query": text}
-                })
+            intent, confidence = _match_intent(text_lower, _PARSE_INTENT_TABLE, ("general_chat", 0.5))
             
-            # Market data queries (generic market info, index prices, etc)
-            # Be more specific - don't match just "stock" alone as it's too generic
-            if any(word in text_lower for word in ["market snapshot", "market data", "nifty", "sensex", "banknifty", "index", "indices", "market price", "market close"]):
-                return JsonResponse({
-                    "intent": "market_data",
-                    "confidence": 0.9,
-                    "entities": {"query": text}
-                })
-            
-            # Search queries
-            if any(word in text_lower for word in ["search", "find", "look for", "show me"]):
-                return JsonResponse({
-                    "intent": "search",
-                    "confidence": 0.8,
-                    "entities": {"query": text}
-                })
+            # Analysis intents carry the original text as the entity to look up
+            if intent in ("analyze_mutual_fund", "stock_analysis"):
+                entities = {"query": original_text, "entity": original_text}
+            else:
+                entities = {"query": text}
             
-            # Default to general chat
-            return JsonResponse({
-                "intent": "general_chat",
-                "confidence": 0.5,
-                "entities": {"query": text}
+            return ojson({
+                "intent": intent,
+                "confidence": confidence,
+                "entities": entities
             })
             
         except Exception as e:
-            return JsonResponse({
+            return ojson({
                 "intent": "error",
                 "confidence": 0.0,
                 "entities": {"error": str(e)}
@@ -530,14 +577,14 @@ class StockSearchView(View):
             # Use real-time search from Yahoo Finance
             stocks = self._search_real_stocks(query, exchange.upper())
             
-            return JsonResponse({
+            return ojson({
                 "stocks": stocks,  # Return all matching stocks
                 "exchange": exchange.upper(),
                 "query": query
             })
             
         except Exception as e:
-            return JsonResponse({
+            return ojson({
                 "error": f"Search failed: {str(e)}",
                 "stocks": [],
                 "exchange": exchange.upper(),
@@ -547,9 +594,6 @@ class StockSearchView(View):
     def _search_real_stocks(self, query, exchange):
         """Search for real stocks using Yahoo Finance"""
         try:
-            import requests
-            import json
-            
             # Yahoo Finance search endpoint
             url = "https://query1.finance.yahoo.com/v1/finance/search"
             params = {
@@ -557,13 +601,9 @@ class StockSearchView(View):
                 "quotesCount": 50,  # Increased to get more results
                 "newsCount": 0
             }
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                "Accept": "application/json",
-                "Referer": "https://finance.yahoo.com/"
-            }
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            # Shared pooled session keeps the TLS connection to Yahoo alive between searches
+            response = stock_data_service.session.get(url, params=params, headers=YAHOO_HEADERS, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 quotes = data.get("quotes", [])
@@ -632,8 +672,7 @@ class StockSearchView(View):
                 return stocks
                 
         except Exception as e:
-            logger.error(f"Real stock search error: {e}")
-            print(f"Real stock search error: {e}")
+            logger.error("Real stock search error: %s", e)
             
         return []
 
@@ -649,7 +688,7 @@ class MutualFundSearchView(View):
             # Use the new MF data service for search
             funds = mf_data_service.search_mutual_funds(query)
             
-            return JsonResponse({
+            return ojson({
                 "funds": funds[:10],  # Limit to 10 results
                 "query": query,
                 "total_results": len(funds)
@@ -657,7 +696,7 @@ class MutualFundSearchView(View):
             
         except Exception as e:
             logger.error(f"MutualFundSearchView error: {e}")
-            return JsonResponse({
+            return ojson({
                 "error": f"Search failed: {str(e)}",
                 "funds": [],
                 "query": query
@@ -674,14 +713,14 @@ class MutualFundCategoriesView(View):
         try:
             categories = mf_data_service.get_fund_categories()
             
-            return JsonResponse({
+            return ojson({
                 "categories": categories,
                 "total_categories": len(categories)
             })
             
         except Exception as e:
             logger.error(f"MutualFundCategoriesView error: {e}")
-            return JsonResponse({
+            return ojson({
                 "error": f"Failed to fetch categories: {str(e)}",
                 "categories": []
             }, status=500)
@@ -692,28 +731,37 @@ class MutualFundCategoriesView(View):
 
 @method_decorator(csrf_exempt, name="dispatch")
 class MutualFundDetailsView(View):
+    # Fund details barely move intraday; share them across requests for a few minutes
+    _DETAILS_CACHE_TIMEOUT = 300
+    
     def get(self, request, scheme_id):
         """Get detailed information about a specific mutual fund"""
         try:
-            fund = mf_data_service.get_fund_by_id(scheme_id)
-            
-            if not fund:
-                return JsonResponse({
-                    "error": f"Fund with scheme ID '{scheme_id}' not found"
-                }, status=404)
-            
-            # Get NAV history for the fund
-            nav_history = mf_data_service.get_fund_nav_history(scheme_id, days=30)
+            cache_key = f"mf_details_{scheme_id}"
+            payload = cache.get(cache_key)
+            if payload is None:
+                fund = mf_data_service.get_fund_by_id(scheme_id)
+                
+                if not fund:
+                    return ojson({
+                        "error": f"Fund with scheme ID '{scheme_id}' not found"
+                    }, status=404)
+                
+                # Get NAV history for the fund
+                nav_history = mf_data_service.get_fund_nav_history(scheme_id, days=30)
+                
+                payload = {
+                    "fund": fund,
+                    "nav_history": nav_history
+                }
+                cache.set(cache_key, payload, self._DETAILS_CACHE_TIMEOUT)
             
-            return JsonResponse({
-                "fund": fund,
-                "nav_history": nav_history,
-                "last_updated": datetime.now().isoformat()
-            })
+            # The timestamp stays per response rather than cached
+            return ojson({**payload, "last_updated": datetime.now().isoformat()})
             
         except Exception as e:
             logger.error(f"MutualFundDetailsView error: {e}")
-            return JsonResponse({
+            return ojson({
                 "error": f"Failed to fetch fund details: {str(e)}"
             }, status=500)
 
@@ -721,6 +769,77 @@ class MutualFundDetailsView(View):
 # Stock Analysis
 # =====================
 
+# Response schema for StockAnalysisView, in output order
+_ANALYSIS_KEYS = (
+    "ticker", "current_market_price", "buy_price", "shares", "total_investment",
+    "current_value", "profit_loss", "profit_loss_percent", "fundamentals", "personalized_advice"
+)
+
+# Fundamentals are per ticker, not per user and change quarterly; share them across requests.
+# When every provider fails the defaults are cached briefly so the chain isn't retried per request
+_FUNDAMENTALS_CACHE_TIMEOUT = 900
+_FUNDAMENTALS_MISS_CACHE_TIMEOUT = 60
+
+# Per-request timeout for the fundamentals providers; they are raced, not waited on in turn
+_FUNDAMENTALS_REQUEST_TIMEOUT = 4
+
+# Market cap display scales, largest first
+_CAP_SCALES = ((1e12, "T"), (1e9, "B"), (1e6, "M"))
+
+
+def _format_market_cap(market_cap):
+    """Format market cap in readable format; providers send numbers or numeric strings"""
+    try:
+        market_cap = int(float(market_cap))
+    except (TypeError, ValueError, OverflowError):
+        return "N/A"
+    return _market_cap_label(market_cap) if market_cap else "N/A"
+
+
+@lru_cache(maxsize=4096)
+def _market_cap_label(market_cap):
+    """Display label for an int market cap, memoized across providers and requests"""
+    for scale, suffix in _CAP_SCALES:
+        if market_cap >= scale:
+            return f"₹{market_cap/scale:.2f}{suffix}"
+    return f"₹{market_cap:,.0f}"
+
+
+def _raw(section, key, default, scale=1):
+    """`raw` value of a Yahoo quoteSummary field times `scale`, or `default` (unscaled)
+    when the field or its raw value is missing"""
+    value = section.get(key, {}).get('raw')
+    return default if value is None else value * scale
+
+
+# yfinance pulls in pandas/numpy/lxml; resolve it on first use only.
+# None = not resolved yet, False = not installed.
+_YF = None
+
+
+def _load_yfinance():
+    """Import yfinance once and return the module, or None if unavailable"""
+    global _YF
+    if _YF is None:
+        try:
+            import yfinance
+            _YF = yfinance
+        except ImportError:
+            _YF = False
+    return _YF or None
+
+# P/L tiers: bisect_left(thresholds, pct) indexes the template; a change equal to a
+# threshold stays in the lower tier, as every tier requires strictly beating its bound
+_STOCK_ANALYSIS_THRESHOLDS = (-10, -5, 0, 5, 10)
+_STOCK_ANALYSIS_TEMPLATES = (
+    "Significant decline. {ticker} is down {pct:.1f}% from your buy price. Review your investment strategy and consider stop-loss.",
+    "Moderate decline. {ticker} is down {pct:.1f}% from your buy price. Consider if this aligns with your investment thesis.",
+    "Minor decline. {ticker} is down {pct:.1f}% from your buy price. This is normal market volatility.",
+    "Positive performance! {ticker} is up {pct:.1f}% from your buy price. Consider holding for long-term growth.",
+    "Good performance! {ticker} is up {pct:.1f}% from your buy price. Hold for further gains.",
+    "Strong performance! {ticker} is up {pct:.1f}% from your buy price. Consider taking partial profits if you need liquidity.",
+)
+
 @method_decorator(csrf_exempt, name="dispatch")
 class StockAnalysisView(View):
     def get(self, request, ticker, buy_price, shares):
@@ -728,9 +847,11 @@ class StockAnalysisView(View):
         try:
             buy_price = float(buy_price)
             shares = int(shares)
+            # Fundamentals cost up to three upstream calls; only fetch them when asked for
+            include_fundamentals = request.GET.get('include_fundamentals') == '1'
             
             # Fetch real stock data
-            current_price, fundamentals = self._fetch_stock_data(ticker)
+            current_price, fundamentals = self._fetch_stock_data(ticker, include_fundamentals)
             
             # Calculate metrics
             total_investment = buy_price * shares
@@ -741,32 +862,32 @@ class StockAnalysisView(View):
             # Generate analysis
             analysis = self._generate_analysis(ticker, current_price, buy_price, fundamentals)
             
-            return JsonResponse({
-                "ticker": ticker,
-                "current_market_price": current_price,
-                "buy_price": buy_price,
-                "shares": shares,
-                "total_investment": total_investment,
-                "current_value": current_value,
-                "profit_loss": profit_loss,
-                "profit_loss_percent": profit_loss_percent,
-                "fundamentals": fundamentals,
-                "personalized_advice": analysis
-            })
+            return ojson(dict(zip(_ANALYSIS_KEYS, (
+                ticker, current_price, buy_price, shares, total_investment,
+                current_value, profit_loss, profit_loss_percent, fundamentals, analysis
+            ))))
             
         except Exception as e:
-            return JsonResponse({
+            return ojson({
                 "error": f"Analysis failed: {str(e)}",
                 "ticker": ticker
             }, status=500)
     
-    def _fetch_stock_data(self, ticker):
+    def _fetch_stock_data(self, ticker, include_fundamentals=True):
         """Fetch real stock data and fundamentals using the robust data service"""
-        print(f"=== StockAnalysisView: Fetching real data for {ticker} ===")
+        logger.debug("StockAnalysisView: Fetching real data for %s", ticker)
         
         # Get current price from the robust data service
         current_price = stock_data_service.get_stock_price(ticker)
         
+        if not include_fundamentals:
+            return current_price, None
+        
+        cache_key = f"stock_fundamentals_{ticker.upper()}"
+        fundamentals = cache.get(cache_key)
+        if fundamentals is not None:
+            return current_price, fundamentals
+        
         # Default fundamentals
         fundamentals = {
             "market_cap": "N/A",
@@ -779,38 +900,50 @@ class StockAnalysisView(View):
             "face_value": 10.0
         }
         
-        # Try to get real fundamentals from multiple sources
+        # Race the two Yahoo-backed sources and take whichever answers first, so a slow
+        # or timing-out provider no longer delays the other
+        fetched = None
+        executor = ThreadPoolExecutor(max_workers=2)
         try:
-            # Method 1: Try Yahoo Finance API directly
-            fetched = self._fetch_fundamentals_yahoo_api(ticker)
-            if fetched:
-                print(f"StockAnalysisView: Got real fundamentals from Yahoo API for {ticker}")
-                fundamentals = fetched
-            else:
-                # Method 2: Try yfinance as fallback
-                fetched = self._fetch_fundamentals_yfinance(ticker)
+            futures = {
+                executor.submit(self._fetch_fundamentals_yahoo_api, ticker): "Yahoo API",
+                executor.submit(self._fetch_fundamentals_yfinance, ticker): "yfinance",
+            }
+            for future in as_completed(futures):
+                try:
+                    fetched = future.result()
+                except Exception as e:
+                    logger.error("StockAnalysisView: Error getting fundamentals from %s: %s", futures[future], e)
+                    continue
                 if fetched:
-                    print(f"StockAnalysisView: Got real fundamentals from yfinance for {ticker}")
-                    fundamentals = fetched
-                else:
-                    # Method 3: Try Alpha Vantage for fundamentals
-                    fetched = self._fetch_fundamentals_alpha_vantage(ticker)
-                    if fetched:
-                        print(f"StockAnalysisView: Got real fundamentals from Alpha Vantage for {ticker}")
-                        fundamentals = fetched
-                    else:
-                        print(f"StockAnalysisView: Using fallback fundamentals for {ticker}")
-        except Exception as e:
-            print(f"StockAnalysisView: Error getting fundamentals: {e}")
+                    logger.debug("StockAnalysisView: Got real fundamentals from %s for %s", futures[future], ticker)
+                    break
+        finally:
+            # Don't wait on the slower source; it finishes or times out in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if not fetched:
+            # Alpha Vantage's free tier has a daily quota, so it stays a last resort
+            try:
+                fetched = self._fetch_fundamentals_alpha_vantage(ticker)
+                if fetched:
+                    logger.debug("StockAnalysisView: Got real fundamentals from Alpha Vantage for %s", ticker)
+            except Exception as e:
+                logger.error("StockAnalysisView: Error getting fundamentals from Alpha Vantage: %s", e)
+        
+        if fetched:
+            fundamentals = fetched
+        else:
+            logger.debug("StockAnalysisView: Using fallback fundamentals for %s", ticker)
         
-        print(f"StockAnalysisView: Returning price {current_price} and fundamentals for {ticker}")
+        cache.set(cache_key, fundamentals, _FUNDAMENTALS_CACHE_TIMEOUT if fetched else _FUNDAMENTALS_MISS_CACHE_TIMEOUT)
+        
+        logger.debug("StockAnalysisView: Returning price %s and fundamentals for %s", current_price, ticker)
         return current_price, fundamentals
     
     def _fetch_fundamentals_yahoo_api(self, ticker):
         """Fetch fundamentals from Yahoo Finance API"""
         try:
-            import requests
-            
             symbol_variants = [f"{ticker}.NS", f"{ticker}.BO", ticker]
             
             for symbol in symbol_variants:
@@ -820,13 +953,7 @@ class StockAnalysisView(View):
                         "symbol": symbol,
                         "modules": "defaultKeyStatistics,financialData,summaryDetail"
                     }
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                        "Accept": "application/json",
-                        "Referer": "https://finance.yahoo.com/"
-                    }
-                    
-                    response = requests.get(url, params=params, headers=headers, timeout=10)
+                    response = stock_data_service.session.get(url, params=params, headers=YAHOO_HEADERS, timeout=_FUNDAMENTALS_REQUEST_TIMEOUT)
                     if response.status_code == 200:
                         data = response.json()
                         result = data.get("quoteSummary", {}).get("result", [])
@@ -838,26 +965,28 @@ class StockAnalysisView(View):
                             
                             if financial_data or key_stats:
                                 return {
-                                    "market_cap": self._format_market_cap(key_stats.get('marketCap')),
-                                    "roe": financial_data.get('returnOnEquity', {}).get('raw', 15.0) * 100 if financial_data.get('returnOnEquity', {}).get('raw') else 15.0,
-                                    "pe_ttm": key_stats.get('trailingPE', {}).get('raw', 20.0) if key_stats.get('trailingPE', {}).get('raw') else 20.0,
-                                    "eps_ttm": key_stats.get('trailingEps', {}).get('raw', 5.0) if key_stats.get('trailingEps', {}).get('raw') else 5.0,
-                                    "pb": key_stats.get('priceToBook', {}).get('raw', 2.0) if key_stats.get('priceToBook', {}).get('raw') else 2.0,
-                                    "dividend_yield": summary_detail.get('dividendYield', {}).get('raw', 2.0) * 100 if summary_detail.get('dividendYield', {}).get('raw') else 2.0,
-                                    "book_value": key_stats.get('bookValue', {}).get('raw', 50.0) if key_stats.get('bookValue', {}).get('raw') else 50.0,
-                                    "face_value": key_stats.get('faceValue', {}).get('raw', 10.0) if key_stats.get('faceValue', {}).get('raw') else 10.0
+                                    "market_cap": _format_market_cap(_raw(key_stats, 'marketCap', None)),
+                                    "roe": _raw(financial_data, 'returnOnEquity', 15.0, scale=100),
+                                    "pe_ttm": _raw(key_stats, 'trailingPE', 20.0),
+                                    "eps_ttm": _raw(key_stats, 'trailingEps', 5.0),
+                                    "pb": _raw(key_stats, 'priceToBook', 2.0),
+                                    "dividend_yield": _raw(summary_detail, 'dividendYield', 2.0, scale=100),
+                                    "book_value": _raw(key_stats, 'bookValue', 50.0),
+                                    "face_value": _raw(key_stats, 'faceValue', 10.0)
                                 }
                 except Exception as e:
-                    print(f"Yahoo API fundamentals error for {symbol}: {e}")
+                    logger.warning("Yahoo API fundamentals error for %s: %s", symbol, e)
                     continue
         except Exception as e:
-            print(f"Yahoo API fundamentals error: {e}")
+            logger.warning("Yahoo API fundamentals error: %s", e)
         return None
     
     def _fetch_fundamentals_yfinance(self, ticker):
         """Fetch fundamentals from yfinance"""
         try:
-            import yfinance as yf
+            yf = _load_yfinance()
+            if yf is None:
+                raise ImportError("yfinance")
             symbol_variants = [f"{ticker}.NS", f"{ticker}.BO", ticker]
             
             for symbol in symbol_variants:
@@ -867,7 +996,7 @@ class StockAnalysisView(View):
                     
                     if info and len(info) > 10:  # Ensure we got real data
                         return {
-                            "market_cap": self._format_market_cap(info.get('marketCap')),
+                            "market_cap": _format_market_cap(info.get('marketCap')),
                             "roe": info.get('returnOnEquity', 15.0) * 100 if info.get('returnOnEquity') else 15.0,
                             "pe_ttm": info.get('trailingPE', 20.0),
                             "eps_ttm": info.get('trailingEps', 5.0),
@@ -877,20 +1006,17 @@ class StockAnalysisView(View):
                             "face_value": info.get('faceValue', 10.0)
                         }
                 except Exception as e:
-                    print(f"yfinance fundamentals error for {symbol}: {e}")
+                    logger.warning("yfinance fundamentals error for %s: %s", symbol, e)
                     continue
         except ImportError:
-            print("yfinance not available for fundamentals")
+            logger.warning("yfinance not available for fundamentals")
         except Exception as e:
-            print(f"yfinance fundamentals error: {e}")
+            logger.warning("yfinance fundamentals error: %s", e)
         return None
     
     def _fetch_fundamentals_alpha_vantage(self, ticker):
         """Fetch fundamentals from Alpha Vantage"""
         try:
-            import requests
-            import os
-            
             api_key = os.getenv('ALPHA_VANTAGE_API_KEY')
             if not api_key or api_key == 'demo':
                 return None
@@ -906,12 +1032,13 @@ class StockAnalysisView(View):
                         'apikey': api_key
                     }
                     
-                    response = requests.get(url, params=params, timeout=10)
+                    # Pooled keep-alive session shared with the other upstream calls
+                    response = stock_data_service.session.get(url, params=params, timeout=_FUNDAMENTALS_REQUEST_TIMEOUT)
                     if response.status_code == 200:
                         data = response.json()
                         if 'Symbol' in data and data['Symbol']:
                             return {
-                                "market_cap": self._format_market_cap(data.get('MarketCapitalization')),
+                                "market_cap": _format_market_cap(data.get('MarketCapitalization')),
                                 "roe": float(data.get('ReturnOnEquityTTM', 15.0)) if data.get('ReturnOnEquityTTM') else 15.0,
                                 "pe_ttm": float(data.get('PERatio', 20.0)) if data.get('PERatio') else 20.0,
                                 "eps_ttm": float(data.get('EPS', 5.0)) if data.get('EPS') else 5.0,
@@ -921,49 +1048,49 @@ class StockAnalysisView(View):
                                 "face_value": float(data.get('FaceValue', 10.0)) if data.get('FaceValue') else 10.0
                             }
                 except Exception as e:
-                    print(f"Alpha Vantage fundamentals error for {symbol}: {e}")
+                    logger.warning("Alpha Vantage fundamentals error for %s: %s", symbol, e)
                     continue
         except Exception as e:
-            print(f"Alpha Vantage fundamentals error: {e}")
+            logger.warning("Alpha Vantage fundamentals error: %s", e)
         return None
     
-    def _format_market_cap(self, market_cap):
-        """Format market cap in readable format"""
-        if not market_cap:
-            return "N/A"
-        
-        if market_cap >= 1e12:
-            return f"₹{market_cap/1e12:.2f}T"
-        elif market_cap >= 1e9:
-            return f"₹{market_cap/1e9:.2f}B"
-        elif market_cap >= 1e6:
-            return f"₹{market_cap/1e6:.2f}M"
-        else:
-            return f"₹{market_cap:,.0f}"
-    
     def _generate_analysis(self, ticker, current_price, buy_price, fundamentals):
         """Generate personalized analysis"""
         price_change = current_price - buy_price
         price_change_percent = (price_change / buy_price * 100) if buy_price > 0 else 0
         
-        if price_change_percent > 10:
-            return f"Strong performance! {ticker} is up {price_change_percent:.1f}% from your buy price. Consider taking partial profits if you need liquidity."
-        elif price_change_percent > 5:
-            return f"Good performance! {ticker} is up {price_change_percent:.1f}% from your buy price. Hold for further gains."
-        elif price_change_percent > 0:
-            return f"Positive performance! {ticker} is up {price_change_percent:.1f}% from your buy price. Consider holding for long-term growth."
-        elif price_change_percent > -5:
-            return f"Minor decline. {ticker} is down {abs(price_change_percent):.1f}% from your buy price. This is normal market volatility."
-        elif price_change_percent > -10:
-            return f"Moderate decline. {ticker} is down {abs(price_change_percent):.1f}% from your buy price. Consider if this aligns with your investment thesis."
-        else:
-            return f"Significant decline. {ticker} is down {abs(price_change_percent):.1f}% from your buy price. Review your investment strategy and consider stop-loss."
+        template = _STOCK_ANALYSIS_TEMPLATES[bisect_left(_STOCK_ANALYSIS_THRESHOLDS, price_change_percent)]
+        return template.format(ticker=ticker, pct=abs(price_change_percent))
 
 # =====================
 # Stock History
 # =====================
 
+def _cache_history_response(view):
+    """Mark successful history responses publicly cacheable for 5 minutes, tagged with
+    an ETag derived from the body, and answer a matching If-None-Match with a 304.
+
+    Errors pass through untouched, and since the tag follows the body, real data and
+    the mock fallback for the same request never share one"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if response.status_code != 200 or response.streaming:
+            return response
+        response["ETag"] = quote_etag(hashlib.blake2s(response.content).hexdigest())
+        patch_cache_control(response, public=True, max_age=300)
+        return get_conditional_response(request, etag=response["ETag"], response=response)
+    return wrapper
+
+# Outermost first: headers and 304s are applied to whatever cache_page returns, so
+# neither the ETag nor a 304 is ever stored in the page cache (which skips errors)
+_history_http_cache = [
+    _cache_history_response,
+    cache_page(60 * 10),
+]
+
 @method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(_history_http_cache, name="get")
 class StockHistoryView(View):
     def get(self, request, ticker):
         """Get stock price history using real data from Yahoo Finance"""
@@ -978,7 +1105,7 @@ class StockHistoryView(View):
                 dates = [item['date'] for item in history]
                 prices = [item['price'] for item in history]
                 
-                return JsonResponse({
+                return ojson({
                     "ticker": ticker,
                     "period": period,
                     "history": prices,  # Return prices array for frontend compatibility
@@ -990,29 +1117,23 @@ class StockHistoryView(View):
                 })
             else:
                 # Fallback to mock data if real data unavailable
-                import random
-                from datetime import datetime, timedelta
-                
                 end_date = datetime.now()
                 days_map = {'1d': 1, '7d': 7, '1m': 30, '1mo': 30, '3mo': 90, '6m': 180, '6mo': 180, '1y': 365}
                 days = days_map.get(period, 365)
                 start_date = end_date - timedelta(days=days)
                 
-                dates = []
-                prices = []
+                dates = _iso_date_range(start_date.date(), min(days, 365))
                 current_price = stock_data_service.get_stock_price(ticker) or 100.0
                 
-                for i in range(min(days, 365)):
-                    date = start_date + timedelta(days=i)
-                    if i == 0:
-                        price = current_price * random.uniform(0.8, 1.2)
-                    else:
-                        price = prices[-1] * random.uniform(0.98, 1.02)
-                    
-                    dates.append(date.strftime('%Y-%m-%d'))
-                    prices.append(round(price, 2))
+                # Random walk in one vectorized pass: a start within +/-20% of the current
+                # price, then daily moves of up to +/-2%
+                rng = _mock_rng(ticker, period)
+                ratios = rng.uniform(0.98, 1.02, size=len(dates))
+                ratios[0] = rng.uniform(0.8, 1.2)
+                # Left as an ndarray: ojson serializes it natively (OPT_SERIALIZE_NUMPY)
+                prices = np.round(current_price * np.cumprod(ratios), 2)
                 
-                return JsonResponse({
+                return ojson({
                     "ticker": ticker,
                     "period": period,
                     "data": {
@@ -1024,7 +1145,7 @@ class StockHistoryView(View):
             
         except Exception as e:
             logger.error(f"Stock history fetch error for {ticker}: {e}")
-            return JsonResponse({
+            return ojson({
                 "error": f"History fetch failed: {str(e)}",
                 "ticker": ticker
             }, status=500)
@@ -1033,6 +1154,23 @@ class StockHistoryView(View):
 # Mutual Fund Analysis
 # =====================
 
+# P/L tiers, lowest first: bisect_left(thresholds, pct) indexes the (advice, strategy) pair
+_MF_ANALYSIS_THRESHOLDS = (-10, -5, 0, 8, 15)
+_MF_ANALYSIS_TIERS = (
+    ("Significant decline. The fund is down {pct:.1f}%. It's crucial to reassess this investment. Check for any fundamental changes in the fund's strategy or sector.",
+     "High underperformance warrants a thorough review. Consider consulting a financial advisor about whether to hold or exit."),
+    ("Moderate decline. Your investment is down {pct:.1f}%. Review the fund's fundamentals and compare with peers to ensure it still meets your risk appetite.",
+     "The fund is underperforming. It's a good time to review its strategy and your investment thesis."),
+    ("Minor decline. The fund is down {pct:.1f}%. This is likely due to normal market volatility. No action needed for long-term investors.",
+     "Short-term fluctuations are normal. For long-term goals, it's best to ignore minor dips."),
+    ("Positive performance. Your investment is up {pct:.1f}%. Stay invested to benefit from long-term growth.",
+     "The fund is delivering positive returns. It's advisable to hold for the long term."),
+    ("Good performance! The fund is up {pct:.1f}%. Continue your SIPs or hold your investment for long-term wealth creation.",
+     "Solid returns. This fund is a strong performer in your portfolio. Staying invested is a good strategy."),
+    ("Excellent performance! Your investment in {name} is up {pct:.1f}%. Consider re-evaluating your allocation or booking partial profits if it aligns with your goals.",
+     "This fund is performing exceptionally well. Monitor its performance and consider if it still fits your long-term strategy."),
+)
+
 @method_decorator(csrf_exempt, name="dispatch")
 class MutualFundAnalysisView(View):
     def get(self, request, scheme_id, buy_nav, units):
@@ -1045,7 +1183,7 @@ class MutualFundAnalysisView(View):
             fund_details = mf_data_service.get_fund_by_id(scheme_id)
 
             if not fund_details:
-                return JsonResponse({
+                return ojson({
                     "error": "FUND_NOT_FOUND",
                     "reasoning": f"Mutual fund with Scheme ID {scheme_id} could not be found."
                 }, status=404)
@@ -1054,7 +1192,7 @@ class MutualFundAnalysisView(View):
             scheme_name = fund_details.get('scheme_name', scheme_id)
 
             if current_nav is None:
-                return JsonResponse({
+                return ojson({
                     "error": "NAV_NOT_AVAILABLE",
                     "reasoning": f"Could not retrieve the current NAV for {scheme_name}."
                 }, status=500)
@@ -1070,26 +1208,11 @@ class MutualFundAnalysisView(View):
             profit_loss_percent = (profit_loss / total_investment * 100) if total_investment > 0 else 0
 
             # Generate analysis
-            if profit_loss_percent > 15:
-                analysis = f"Excellent performance! Your investment in {scheme_name} is up {profit_loss_percent:.1f}%. Consider re-evaluating your allocation or booking partial profits if it aligns with your goals."
-                strategy = "This fund is performing exceptionally well. Monitor its performance and consider if it still fits your long-term strategy."
-            elif profit_loss_percent > 8:
-                analysis = f"Good performance! The fund is up {profit_loss_percent:.1f}%. Continue your SIPs or hold your investment for long-term wealth creation."
-                strategy = "Solid returns. This fund is a strong performer in your portfolio. Staying invested is a good strategy."
-            elif profit_loss_percent > 0:
-                analysis = f"Positive performance. Your investment is up {profit_loss_percent:.1f}%. Stay invested to benefit from long-term growth."
-                strategy = "The fund is delivering positive returns. It's advisable to hold for the long term."
-            elif profit_loss_percent > -5:
-                analysis = f"Minor decline. The fund is down {abs(profit_loss_percent):.1f}%. This is likely due to normal market volatility. No action needed for long-term investors."
-                strategy = "Short-term fluctuations are normal. For long-term goals, it's best to ignore minor dips."
-            elif profit_loss_percent > -10:
-                analysis = f"Moderate decline. Your investment is down {abs(profit_loss_percent):.1f}%. Review the fund's fundamentals and compare with peers to ensure it still meets your risk appetite."
-                strategy = "The fund is underperforming. It's a good time to review its strategy and your investment thesis."
-            else:
-                analysis = f"Significant decline. The fund is down {abs(profit_loss_percent):.1f}%. It's crucial to reassess this investment. Check for any fundamental changes in the fund's strategy or sector."
-                strategy = "High underperformance warrants a thorough review. Consider consulting a financial advisor about whether to hold or exit."
+            pct = abs(profit_loss_percent)
+            advice, strategy = _MF_ANALYSIS_TIERS[bisect_left(_MF_ANALYSIS_THRESHOLDS, profit_loss_percent)]
+            analysis = advice.format(name=scheme_name, pct=pct)
 
-            return JsonResponse({
+            return ojson({
                 "scheme_id": scheme_id,
                 "scheme_name": scheme_name,
                 "current_nav": current_nav,
@@ -1106,7 +1229,7 @@ class MutualFundAnalysisView(View):
 
         except Exception as e:
             logger.error(f"MutualFundAnalysisView error: {e}")
-            return JsonResponse({
+            return ojson({
                 "error": f"Analysis failed: {str(e)}",
                 "scheme_id": scheme_id
             }, status=500)
@@ -1116,6 +1239,7 @@ class MutualFundAnalysisView(View):
 # =====================
 
 @method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(_history_http_cache, name="get")
 class MutualFundHistoryView(View):
     def get(self, request, scheme_id):
         """Get mutual fund NAV history"""
@@ -1147,7 +1271,7 @@ class MutualFundHistoryView(View):
                         logger.warning(f"Skipping invalid NAV data point for {scheme_id}: {item}")
                         continue
                 
-                return JsonResponse({
+                return ojson({
                     "scheme_id": scheme_id,
                     "period": period,
                     "history": navs, # For frontend compatibility
@@ -1164,34 +1288,28 @@ class MutualFundHistoryView(View):
         except Exception as e:
             logger.warning(f"Could not fetch real MF history for {scheme_id}: {e}. Falling back to mock data.")
             # Mock historical NAV data as a fallback
-            import random
-            from datetime import datetime, timedelta
-            
             end_date = datetime.now()
             days = 365
-            start_date = end_date - timedelta(days=days)
+            start_date = end_date - timedelta(days=days - 1)
             
-            dates = []
-            navs = []
+            dates = _iso_date_range(start_date.date(), days)
+            rng = _mock_rng(scheme_id, period)
             # Try to get at least the current NAV to make mock data more realistic
             try:
                 fund_details = mf_data_service.get_fund_by_id(scheme_id)
-                base_nav = float(fund_details.get('nav', random.uniform(50, 200)))
+                base_nav = float(fund_details.get('nav', rng.uniform(50, 200)))
             except:
-                base_nav = random.uniform(50, 200)
+                base_nav = rng.uniform(50, 200)
 
-            # Generate mock data backwards from current NAV
-            current_mock_nav = base_nav
-            for i in range(days):
-                date = end_date - timedelta(days=i)
-                dates.append(date.strftime('%Y-%m-%d'))
-                navs.append(round(current_mock_nav, 4))
-                current_mock_nav /= random.uniform(0.998, 1.002) # Simulate previous day's NAV
-            
-            dates.reverse()
-            navs.reverse()
+            # Generate mock data backwards from current NAV: each earlier day divides
+            # out one more daily move, computed in one vectorized pass
+            divisors = np.ones(days)
+            divisors[1:] = rng.uniform(0.998, 1.002, size=days - 1)
+            # Reversed before dividing so the result is a fresh C-contiguous array, which
+            # ojson can serialize natively (OPT_SERIALIZE_NUMPY)
+            navs = np.round(base_nav / np.cumprod(divisors)[::-1], 4)
 
-            return JsonResponse({
+            return ojson({
                 "scheme_id": scheme_id,
                 "period": period,
                 "data": {
@@ -1209,7 +1327,7 @@ class MutualFundHistoryView(View):
 class DevVersionView(View):
     def get(self, request):
         """Development version endpoint"""
-        return JsonResponse({
+        return ojson({
             "version": "1.0.0",
             "status": "development",
             "timestamp": "2025-01-02T00:00:00Z"
@@ -1219,87 +1337,164 @@ class DevVersionView(View):
 # Chat View
 # =====================
 
+# (intent, confidence, keyword matcher) for ChatView._parse_intent, in priority order.
+# Whole words only, so e.g. "address" is not an "add" and "stockpile" not a "stock"
+_CHAT_INTENT_TABLE = (
+    ("market_data", 0.9, _keyword_re(
+        "market", "markets", "nifty", "sensex", "stock", "price", "prices", "priced", "pricing",
+        "index", "indices", whole_words=True)),
+    ("portfolio", 0.9, _keyword_re(
+        "portfolio", "portfolios", "holding", "holdings", "stocks", "investments", "my stocks",
+        whole_words=True)),
+    ("add_to_portfolio", 0.8, _keyword_re(
+        "add", "adds", "added", "adding", "buy", "buys", "buying", "bought",
+        "purchase", "purchases", "purchased", "purchasing",
+        "invest", "invests", "invested", "investing", "investment", whole_words=True)),
+    ("advice", 0.8, _keyword_re(
+        "advice", "recommend", "recommends", "recommended", "recommending", "recommendation",
+        "recommendations", "should i", "what do you think", whole_words=True)),
+)
+
+# Comprehensive financial keywords - if ANY of these appear, DO NOT use Gemini
+_FINANCIAL_KEYWORDS = (
+    "stock", "share", "price", "market", "nifty", "sensex", "portfolio",
+    "invest", "investment", "mutual fund", "nav", "returns", "profit",
+    "loss", "buy", "sell", "ticker", "equity", "bond", "dividend",
+    "valuation", "pe ratio", "eps", "revenue", "earnings", "financial",
+    "analysis", "analyze", "chart", "graph", "trend", "sector", "index",
+    "holding", "asset", "fund", "scheme", "amc", "aum", "sip", "lumpsum",
+    "capital", "gains", "tax", "stcg", "ltcg", "brokerage", "stocks",
+    "shares", "equities", "securities", "trading", "trader", "investor",
+    "diversification", "risk", "return", "volatility", "beta",
+    "alpha", "sharpe", "ratio", "fundamental", "technical", "candlestick"
+)
+_FINANCIAL_KEYWORDS_RE = _keyword_re(*_FINANCIAL_KEYWORDS)
+# Narrower set used to reject Gemini replies that drift into finance
+_CORE_FINANCIAL_KEYWORDS_RE = _keyword_re(*_FINANCIAL_KEYWORDS[:10])
+_SIMPLE_GENERAL_RE = _keyword_re(
+    "hi", "hello", "hey", "good morning", "good afternoon", "good evening",
+    "what can you do", "what do you do", "help", "how are you", "thanks",
+    "thank you", "who are you", "what are you", "tell me about yourself"
+)
+
+# Canned ChatView replies
+_MARKET_DATA_RESPONSE = "I can help you with market data! You can ask about NIFTY, SENSEX, or specific stock prices. What would you like to know?"
+_ADD_TO_PORTFOLIO_RESPONSE = "To add stocks to your portfolio, use the search function and click 'Add to Portfolio' after analyzing a stock."
+_ADVICE_RESPONSES = (
+    "Based on current market conditions, I recommend diversifying your portfolio across different sectors.",
+    "Consider investing in blue-chip stocks for stable returns and growth stocks for higher potential gains.",
+    "Always do your own research before making investment decisions. Past performance doesn't guarantee future results.",
+    "For long-term wealth creation, consider systematic investment plans (SIPs) in mutual funds.",
+    "Keep an eye on market trends but don't let short-term volatility affect your long-term investment strategy."
+)
+
+_GENERAL_RESPONSES = (
+    "I'm your AI investment assistant! I can help you with market data, portfolio analysis, and investment advice.",
+    "Feel free to ask me about stocks, market trends, or your portfolio. I'm here to help!",
+    "I'm your AI investment assistant. Ask me about market data, your portfolio, or investment strategies.",
+    "Hello! I can help you with stock analysis, portfolio management, and market insights. What would you like to know?",
+    "Hi there! I'm here to assist with your investment queries. Try asking about stocks, mutual funds, or your portfolio."
+)
+
+# Intents whose reply never depends on the request, pre-encoded once as response bodies
+_CANNED_CHAT_BODIES = {
+    intent: tuple(orjson.dumps({"response": text, "intent": intent}) for text in texts)
+    for intent, texts in (
+        ("market_data", (_MARKET_DATA_RESPONSE,)),
+        ("add_to_portfolio", (_ADD_TO_PORTFOLIO_RESPONSE,)),
+        ("advice", _ADVICE_RESPONSES),
+    )
+}
+# Chat portfolio summary templates, bound once
+_PORTFOLIO_LINE = "{ticker}: {quantity} shares at ₹{average_buy_price} (Current: ₹{current_price:.2f}, P/L: {profit_loss_percent:+.1f}%)".format
+_PORTFOLIO_TOTALS = (
+    "\n\nTotal Investment: ₹{total_invested:.2f}"
+    "\nCurrent Value: ₹{total_current_value:.2f}"
+    "\nTotal P/L: ₹{total_profit_loss:.2f} ({total_profit_loss_percent:+.1f}%)"
+).format
+
+# Rule-based fallback bodies for the general intent when Gemini does not answer
+_GENERAL_CHAT_BODIES = tuple(
+    orjson.dumps({"response": text, "intent": "general"}) for text in _GENERAL_RESPONSES
+)
+
+# Chat replies are repetitive text; compress them for mobile clients that accept gzip
+@method_decorator(gzip_page, name="dispatch")
 @method_decorator(csrf_exempt, name="dispatch")
 class ChatView(View):
     def post(self, request):
+        # Reject anonymous traffic before parsing or routing anything
+        if not request.user.is_authenticated:
+            return _err(_ERR_AUTH_REQUIRED, 401)
+        
         try:
-            data = json.loads(request.body.decode("utf-8"))
-            message = data.get("message", "").strip()
+            data = orjson.loads(request.body)
+            message = (data.get("message") or "").strip()
             
             if not message:
-                return JsonResponse({"error": "Message is required"}, status=400)
+                return _err(_ERR_MESSAGE_REQUIRED, 400)
+            
+            # Fold case once; intent parsing and the general handler share it
+            message_lower = message.casefold()
             
             # Parse intent
-            intent_response = self._parse_intent(message)
+            intent_response = self._parse_intent(message_lower)
             intent = intent_response.get("intent", "general")
             
-            # Generate response based on intent
-            if intent == "market_data":
-                response = self._handle_market_data_query(message)
-            elif intent == "portfolio":
-                response = self._handle_portfolio_query(request, message)
-            elif intent == "add_to_portfolio":
-                response = self._handle_add_portfolio_query(message)
-            elif intent == "advice":
-                response = self._handle_advice_query(message)
-            else:
-                response = self._handle_general_query(message)
+            # Static intents (and the general fallback) answer with a pre-encoded body
+            canned = _CANNED_CHAT_BODIES.get(intent)
+            if canned is None:
+                # Generate response based on intent
+                if intent == "portfolio":
+                    response = self._handle_portfolio_query(request, message)
+                else:
+                    response = self._handle_general_query(message, message_lower)
+                
+                if response is not None:
+                    return ojson({
+                        "response": response,
+                        "intent": intent
+                    })
+                canned = _GENERAL_CHAT_BODIES
             
-            return JsonResponse({
-                "response": response,
-                "intent": intent
-            })
+            return HttpResponse(canned[random.randrange(len(canned))], content_type="application/json")
             
         except Exception as e:
-            return JsonResponse({
+            return ojson({
                 "error": f"Chat processing failed: {str(e)}"
             }, status=500)
     
-    def _parse_intent(self, message):
-        """Parse user intent from message"""
-        message_lower = message.lower()
-        
-        # Market data queries
-        if any(word in message_lower for word in ["market", "nifty", "sensex", "stock", "price", "index", "indices"]):
-            return {"intent": "market_data", "confidence": 0.9}
-        
-        # Portfolio queries
-        if any(word in message_lower for word in ["portfolio", "holdings", "stocks", "investments", "my stocks"]):
-            return {"intent": "portfolio", "confidence": 0.9}
-        
-        # Add to portfolio queries
-        if any(word in message_lower for word in ["add", "buy", "purchase", "invest"]):
-            return {"intent": "add_to_portfolio", "confidence": 0.8}
-        
-        # Advice queries
-        if any(word in message_lower for word in ["advice", "recommend", "should i", "what do you think"]):
-            return {"intent": "advice", "confidence": 0.8}
-        
-        # Default to general chat
-        return {"intent": "general", "confidence": 0.5}
-    
-    def _handle_market_data_query(self, message):
-        """Handle market data queries"""
-        return "I can help you with market data! You can ask about NIFTY, SENSEX, or specific stock prices. What would you like to know?"
+    def _parse_intent(self, message_lower):
+        """Parse user intent from the case-folded message"""
+        intent, confidence = _match_intent(message_lower, _CHAT_INTENT_TABLE, ("general", 0.5))
+        return {"intent": intent, "confidence": confidence}
     
     def _handle_portfolio_query(self, request, message):
         """Handle portfolio queries"""
-        if not request.user.is_authenticated:
-            return "Please log in to view your portfolio."
-        
         try:
-            holdings = Holding.objects.filter(portfolio__user=request.user)
-            if not holdings.exists():
+            # Holdings rarely change and prices are cached for a minute, so the rendered
+            # summary is reused until either moves on
+            cache_key = f"portfolio_summary_{request.user.id}_{portfolio_version(request.user.id)}_{int(time.time() // 60)}"
+            summary = cache.get(cache_key)
+            if summary is not None:
+                return summary
+            
+            # Materialize once: the emptiness check, total and per-holding lines share one query
+            holdings = list(Holding.objects.filter(portfolio__user=request.user).annotate(
+                invested=_INVESTED_EXPR
+            ).values_list('ticker', 'quantity', 'average_buy_price', 'invested', named=True))
+            if not holdings:
                 return "You don't have any stocks in your portfolio yet. Add some stocks to get started!"
-            
+
+            # Display-only figures formatted to 2 places; plain float arithmetic is enough
             portfolio_summary = []
-            total_invested = Decimal('0')
-            total_current_value = Decimal('0')
+            total_invested = total_current_value = 0.0
+            prices = stock_data_service.get_stock_prices([holding.ticker for holding in holdings])
             
             for holding in holdings:
-                current_price = stock_data_service.get_stock_price(holding.ticker)
-                current_value = Decimal(str(current_price)) * holding.quantity
-                invested_value = holding.average_buy_price * holding.quantity
+                current_price = prices[holding.ticker]
+                current_value = current_price * holding.quantity
+                invested_value = float(holding.invested)
                 
                 total_invested += invested_value
                 total_current_value += current_value
@@ -1307,76 +1502,44 @@ class ChatView(View):
                 profit_loss = current_value - invested_value
                 profit_loss_percent = (profit_loss / invested_value * 100) if invested_value > 0 else 0
                 
-                portfolio_summary.append(
-                    f"{holding.ticker}: {holding.quantity} shares at ₹{holding.average_buy_price} "
-                    f"(Current: ₹{current_price:.2f}, P/L: {profit_loss_percent:+.1f}%)"
-                )
+                portfolio_summary.append(_PORTFOLIO_LINE(
+                    ticker=holding.ticker,
+                    quantity=holding.quantity,
+                    average_buy_price=holding.average_buy_price,
+                    current_price=current_price,
+                    profit_loss_percent=profit_loss_percent
+                ))
             
             total_profit_loss = total_current_value - total_invested
             total_profit_loss_percent = (total_profit_loss / total_invested * 100) if total_invested > 0 else 0
             
-            summary = f"Your portfolio summary:\n" + "\n".join(portfolio_summary)
-            summary += f"\n\nTotal Investment: ₹{total_invested:.2f}"
-            summary += f"\nCurrent Value: ₹{total_current_value:.2f}"
-            summary += f"\nTotal P/L: ₹{total_profit_loss:.2f} ({total_profit_loss_percent:+.1f}%)"
+            summary = "Your portfolio summary:\n" + "\n".join(portfolio_summary) + _PORTFOLIO_TOTALS(
+                total_invested=total_invested,
+                total_current_value=total_current_value,
+                total_profit_loss=total_profit_loss,
+                total_profit_loss_percent=total_profit_loss_percent
+            )
             
+            cache.set(cache_key, summary, 60)
             return summary
             
         except Exception as e:
             return f"Sorry, I couldn't retrieve your portfolio information. Error: {str(e)}"
     
-    def _handle_add_portfolio_query(self, message):
-        """Handle add to portfolio queries"""
-        return "To add stocks to your portfolio, use the search function and click 'Add to Portfolio' after analyzing a stock."
-    
-    def _handle_advice_query(self, message):
-        """Handle advice queries"""
-        advice_responses = [
-            "Based on current market conditions, I recommend diversifying your portfolio across different sectors.",
-            "Consider investing in blue-chip stocks for stable returns and growth stocks for higher potential gains.",
-            "Always do your own research before making investment decisions. Past performance doesn't guarantee future results.",
-            "For long-term wealth creation, consider systematic investment plans (SIPs) in mutual funds.",
-            "Keep an eye on market trends but don't let short-term volatility affect your long-term investment strategy."
-        ]
-        return random.choice(advice_responses)
-    
-    def _handle_general_query(self, message):
+    def _handle_general_query(self, message, message_lower):
         """Handle general queries - STRICTLY use Gemini ONLY for non-financial general questions like 'hi', 'what can you do', etc."""
-        message_lower = message.lower().strip()
-        
-        # Comprehensive financial keywords - if ANY of these appear, DO NOT use Gemini
-        financial_keywords = [
-            "stock", "share", "price", "market", "nifty", "sensex", "portfolio", 
-            "invest", "investment", "mutual fund", "nav", "returns", "profit", 
-            "loss", "buy", "sell", "ticker", "equity", "bond", "dividend", 
-            "valuation", "pe ratio", "eps", "revenue", "earnings", "financial",
-            "analysis", "analyze", "chart", "graph", "trend", "sector", "index",
-            "holding", "asset", "fund", "scheme", "amc", "aum", "sip", "lumpsum",
-            "capital", "gains", "tax", "stcg", "ltcg", "brokerage", "stocks",
-            "shares", "equities", "securities", "trading", "trader", "investor",
-            "portfolio", "diversification", "risk", "return", "volatility", "beta",
-            "alpha", "sharpe", "ratio", "fundamental", "technical", "candlestick"
-        ]
-        
         # Check if it's a financial query - STRICT CHECK
-        is_financial_query = any(keyword in message_lower for keyword in financial_keywords)
+        is_financial_query = _FINANCIAL_KEYWORDS_RE.search(message_lower) is not None
         
         # ONLY use Gemini for completely non-financial general queries like greetings, help, what can you do
         # Examples: "hi", "hello", "what can you do", "help", "how are you", "thanks"
         if not is_financial_query:
             # Additional check: Only use Gemini for very simple general queries
-            simple_general_queries = [
-                "hi", "hello", "hey", "good morning", "good afternoon", "good evening",
-                "what can you do", "what do you do", "help", "how are you", "thanks",
-                "thank you", "who are you", "what are you", "tell me about yourself"
-            ]
-            
-            is_simple_general = any(query in message_lower for query in simple_general_queries)
+            is_simple_general = _SIMPLE_GENERAL_RE.search(message_lower) is not None
             
             # ONLY use Gemini for simple general queries, NOT for any financial context
             if is_simple_general:
                 try:
-                    from .gemini_service import gemini_service
                     if gemini_service and gemini_service.enabled:
                         # Use Gemini ONLY for general conversation, NOT for financial data
                         intent_response = gemini_service.understand_user_query(message, context={})
@@ -1397,27 +1560,17 @@ class ChatView(View):
                             
                             # Final safety check: if response contains financial keywords, reject it
                             response_lower = response.lower() if response else ""
-                            if not any(keyword in response_lower for keyword in financial_keywords[:10]):
+                            if not _CORE_FINANCIAL_KEYWORDS_RE.search(response_lower):
                                 logger.info("Gemini used for general non-financial query")
                                 return response
                             else:
                                 logger.warning("Gemini response contained financial keywords, rejecting")
-                except ImportError:
-                    # Gemini not available, fallback to rule-based
-                    logger.debug("Gemini service not available, using rule-based chat")
                 except Exception as e:
                     logger.debug(f"Gemini error: {e}, falling back to rule-based")
         
         # Rule-based responses for financial queries or when Gemini is unavailable
-        # These responses are safe and don't use Gemini
-        general_responses = [
-            "I'm your AI investment assistant! I can help you with market data, portfolio analysis, and investment advice.",
-            "Feel free to ask me about stocks, market trends, or your portfolio. I'm here to help!",
-            "I'm your AI investment assistant. Ask me about market data, your portfolio, or investment strategies.",
-            "Hello! I can help you with stock analysis, portfolio management, and market insights. What would you like to know?",
-            "Hi there! I'm here to assist with your investment queries. Try asking about stocks, mutual funds, or your portfolio."
-        ]
-        return random.choice(general_responses)
+        # These responses are safe and don't use Gemini; None tells post() to send one
+        return None
 
 # =====================
 # Dashboard Views
@@ -1443,8 +1596,9 @@ def profile_view(request):
     """User profile view"""
     return render(request, 'advisor/profile.html')
 
+@cache_page(60 * 60)
 def about_view(request):
-    """About page view"""
+    """About page view (static content, cached for an hour)"""
     return render(request, 'advisor/about.html')
 
 def portfolio_page_view(request):